@@ -1,21 +1,174 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import firebase_admin
 from firebase_admin import auth as firebase_auth
+from cachetools import TTLCache
+import asyncio
+import concurrent.futures
+import hashlib
+import jwt
 import logging
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Cache of verified tokens: sha256(token) -> (decoded claims, expiry timestamp)
+# Raw tokens are never stored. Entries are also re-checked against the JWT's own
+# "exp" claim on every hit, so the fixed TTL only bounds memory.
+_token_cache = TTLCache(maxsize=10_000, ttl=3600)
+_token_cache_lock = threading.Lock()
+# Stop serving a cached token this many seconds before it actually expires
+TOKEN_EXPIRY_LEEWAY = 30
+
+# verify_id_token does a blocking RSA signature check; run it off the event loop
+_verify_pool = concurrent.futures.ThreadPoolExecutor(
+    max_workers=8, thread_name_prefix="firebase-verify"
+)
+
+
+# Firebase's ID-token signing keys as a JWKS. PyJWKClient caches the key set
+# (refetching once for an unknown "kid"), and signatures are checked by
+# PyJWT through cryptography's OpenSSL-backed RSA.
+FIREBASE_JWKS_URL = (
+    "https://www.googleapis.com/service_accounts/v1/jwk/securetoken@system.gserviceaccount.com"
+)
+_jwks_client = jwt.PyJWKClient(FIREBASE_JWKS_URL, cache_jwk_set=True, lifespan=3600)
+
+
+def _firebase_project_id():
+    """FIREBASE_PROJECT_ID, else the initialized Firebase app's project id, else None."""
+    project_id = os.getenv("FIREBASE_PROJECT_ID")
+    if project_id:
+        return project_id
+    try:
+        return firebase_admin.get_app().project_id
+    except ValueError:  # Firebase app not initialized
+        return None
+
+
+def _decode_id_token(id_token: str) -> dict:
+    """
+    Verify a Firebase ID token and return its claims (with "uid" set).
+
+    Checks the same claims as firebase_admin.auth.verify_id_token (RS256
+    signature, aud/iss for the project, exp/iat, sub, auth_time) and raises
+    the same firebase_auth exceptions. Without a known project id it defers
+    to the Admin SDK.
+    """
+    project_id = _firebase_project_id()
+    if not project_id:
+        return firebase_auth.verify_id_token(id_token)
+
+    try:
+        signing_key = _jwks_client.get_signing_key_from_jwt(id_token)
+        decoded = jwt.decode(
+            id_token,
+            signing_key.key,
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+        )
+    except jwt.PyJWKClientConnectionError as e:
+        # Google's key endpoint is unreachable - not the caller's fault, so
+        # don't report it as a bad token (same error the Admin SDK raises)
+        raise firebase_auth.CertificateFetchError(f"Failed to fetch Firebase signing keys: {e}", e)
+    except jwt.ExpiredSignatureError as e:
+        raise firebase_auth.ExpiredIdTokenError("Firebase ID token has expired", e)
+    except jwt.PyJWTError as e:
+        raise firebase_auth.InvalidIdTokenError(f"Invalid Firebase ID token: {e}", e)
+
+    sub = decoded["sub"]
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise firebase_auth.InvalidIdTokenError('Firebase ID token has an invalid "sub" claim')
+    auth_time = decoded.get("auth_time")
+    if not isinstance(auth_time, (int, float)) or auth_time > time.time():
+        raise firebase_auth.InvalidIdTokenError('Firebase ID token has an invalid "auth_time" claim')
+    decoded["uid"] = sub
+    return decoded
+
+
+def warm_signing_keys() -> None:
+    """
+    Fetch Firebase's signing keys ahead of the first request (run at startup),
+    so the first token verification doesn't wait on Google. Failures are only
+    logged; the keys are then fetched on demand as before.
+    """
+    if not _firebase_project_id():
+        return
+    try:
+        _jwks_client.get_jwk_set()
+    except Exception as e:
+        logger.warning(f"Could not prefetch Firebase signing keys: {e}")
+
+
+def _token_cache_key(id_token: str) -> str:
+    return hashlib.sha256(id_token.encode()).hexdigest()
+
+
+def _get_cached_token(key: str):
+    """Return cached decoded claims for a token hash, or None if missing/expired."""
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is None:
+            return None
+        decoded, expiry_ts = entry
+        if expiry_ts <= time.time():
+            _token_cache.pop(key, None)
+            return None
+        return decoded
+
+
+def _cache_token(key: str, decoded: dict):
+    """Cache decoded claims until shortly before the token's own expiry."""
+    exp = decoded.get("exp")
+    if not exp:
+        return
+    expiry_ts = int(exp) - TOKEN_EXPIRY_LEEWAY
+    if expiry_ts <= time.time():
+        return
+    with _token_cache_lock:
+        _token_cache[key] = (decoded, expiry_ts)
+
+
+async def verify_id_token_cached(id_token: str) -> dict:
+    """
+    Verify an ID token, serving repeat tokens from the cache.
+
+    Cache misses are verified (see _decode_id_token) on a worker thread so
+    the event loop stays free. Raises the same errors as _decode_id_token.
+    """
+    cache_key = _token_cache_key(id_token)
+    decoded = _get_cached_token(cache_key)
+    if decoded is None:
+        decoded = await asyncio.get_running_loop().run_in_executor(
+            _verify_pool, _decode_id_token, id_token
+        )
+        _cache_token(cache_key, decoded)
+    return decoded
+
+
 async def verify_firebase_token(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    request: Request = None,
 ):
     """
     Verify Firebase ID token and return decoded token data.
     This is the main authentication function.
+
+    Verified tokens are cached (keyed by their SHA-256) until just before
+    their "exp" claim, so repeat requests skip the signature check (see
+    verify_id_token_cached).
+
+    The verified UID is stored on request.state for per-user rate limiting.
     """
     try:
-        id_token = credentials.credentials
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = await verify_id_token_cached(credentials.credentials)
+        if request is not None:
+            request.state.firebase_uid = decoded.get("uid")
         return decoded
     except ValueError as e:
         # Invalid token format
@@ -0,0 +1,105 @@
+"""
+TTL caches for read-mostly API responses.
+
+Values must be JSON-serialisable (store model_dump(mode="json") output).
+When REDIS_URL is set and the redis package is installed, entries live in
+Redis so they are shared - and invalidated - across all workers; otherwise
+each worker keeps a thread-safe in-process cache. Either way, entries must
+be invalidated on every write that changes the cached data.
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Hashable, Optional
+import orjson
+from cachetools import TTLCache
+
+try:
+    import redis
+except ImportError:  # optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL")
+_redis_client = redis.Redis.from_url(REDIS_URL) if redis is not None and REDIS_URL else None
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """TTL cache mapping a key to an already-built, JSON-serialisable response."""
+
+    def __init__(self, name: str, maxsize: int, ttl: int):
+        self.name = name
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        _caches.append(self)
+
+    def _redis_key(self, key: Hashable) -> str:
+        return f"{self.name}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired."""
+        if _redis_client is not None:
+            try:
+                raw = _redis_client.get(self._redis_key(key))
+            except redis.RedisError as e:
+                # A cache outage should degrade to a miss, not a 500
+                logger.warning(f"Redis get failed for {self.name}: {e}")
+                return None
+            return orjson.loads(raw) if raw is not None else None
+
+        with self._lock:
+            value = self._cache.get(key, _MISSING)
+        return None if value is _MISSING else value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if _redis_client is not None:
+            try:
+                _redis_client.set(self._redis_key(key), orjson.dumps(value), ex=self.ttl)
+            except redis.RedisError as e:
+                logger.warning(f"Redis set failed for {self.name}: {e}")
+            return
+
+        with self._lock:
+            self._cache[key] = value
+
+    def invalidate(self, key: Hashable) -> None:
+        if _redis_client is not None:
+            try:
+                _redis_client.delete(self._redis_key(key))
+            except redis.RedisError as e:
+                logger.warning(f"Redis delete failed for {self.name}: {e}")
+            return
+
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """Empty the in-process cache (Redis entries expire on their own)."""
+        with self._lock:
+            self._cache.clear()
+
+
+_caches: list[ResponseCache] = []
+
+
+def clear_all_caches() -> None:
+    """Empty every in-process ResponseCache (used by tests)."""
+    for cache in _caches:
+        cache.clear()
+
+
+# Profile responses (GET /api/users/{user_id} and /api/users/me), keyed by user id
+user_profile_cache = ResponseCache("user", maxsize=10_000, ttl=60)
+# Firebase UID -> user id (also backs dependencies.get_current_user_id). The
+# mapping never changes for a live account; delete_current_user drops the entry,
+# and the Firebase account is deleted with it, so other workers' stale entries
+# only matter for tokens issued before the deletion.
+user_id_by_firebase_uid_cache = ResponseCache("uid", maxsize=10_000, ttl=3600)
+# Item detail responses (GET /api/items/{item_id}), keyed by item id. Shorter
+# TTL than profiles since status flips as buy requests/transactions progress.
+item_cache = ResponseCache("item", maxsize=10_000, ttl=60)
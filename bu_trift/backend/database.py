@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 import os
 
 # Use PostgreSQL on Render (from DATABASE_URL env var), SQLite locally
@@ -17,15 +18,31 @@ if DATABASE_URL.startswith("sqlite"):
         DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
+elif os.getenv("DB_PGBOUNCER", "").lower() in ("1", "true"):
+    # PostgreSQL behind PgBouncer (e.g. port 6432): PgBouncer already pools
+    # server connections, so don't hold a second pool in every worker
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=NullPool,
+        pool_pre_ping=True,
+        query_cache_size=1200,
+    )
 else:
     # PostgreSQL (production on Render)
-    # Increase pool size to handle WebSocket connections better
+    # Increase pool size to handle WebSocket connections better.
+    # Sizing rule: pool_size + max_overflow per worker should cover the requests
+    # a worker has in flight at once, and workers x (pool_size + max_overflow)
+    # must stay below Postgres' max_connections: up to 30 per worker with the
+    # defaults below, times WEB_CONCURRENCY (see start.sh). Check /debug/pool under load.
     engine = create_engine(
         DATABASE_URL,
         pool_pre_ping=True,  # Verify connections before using
-        pool_size=10,  # Increased from default 5
-        max_overflow=20,  # Increased overflow capacity
-        pool_recycle=3600  # Recycle connections after 1 hour
+        pool_size=int(os.getenv("DB_POOL_SIZE", "10")),  # Increased from default 5
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),  # Increased overflow capacity
+        pool_recycle=1800,  # Recycle connections after 30 minutes (before Render drops idle ones)
+        pool_timeout=30,  # Fail fast instead of hanging when the pool is exhausted
+        echo_pool=os.getenv("SQL_ECHO_POOL", "").lower() in ("1", "true"),  # Log checkouts/checkins for ops
+        query_cache_size=1200,  # Compiled-statement cache per engine (default 500)
     )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -36,4 +53,16 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def pool_stats() -> dict:
+    """Connection pool usage for the engine (served by /debug/pool)."""
+    pool = engine.pool
+    stats = {"pool_class": type(pool).__name__, "status": pool.status()}
+    # QueuePool-only counters; NullPool/SingletonThreadPool don't track them
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if callable(counter):
+            stats[name] = counter()
+    return stats
@@ -6,13 +6,28 @@ across endpoints.
 """
 
 from fastapi import Depends, HTTPException
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 from database import get_db
 from auth import verify_token
+from cache import user_id_by_firebase_uid_cache
+from models.conversation import ConversationDB
+from models.item import ItemDB
 from models.user import UserDB
+from utils.db_utils import get_or_404
 
 logger = None  # Will be imported if needed
 
+# Runs on every authenticated request; built once and parameterised
+SELECT_USER_BY_FIREBASE_UID = select(UserDB).where(UserDB.firebase_uid == bindparam("firebase_uid"))
+SELECT_USER_ID_BY_FIREBASE_UID = select(UserDB.id).where(UserDB.firebase_uid == bindparam("firebase_uid"))
+# Item plus the requesting user's id in one round trip for the item write endpoints
+SELECT_ITEM_AND_USER_ID_BY_FIREBASE_UID = (
+    select(ItemDB, UserDB.id)
+    .outerjoin(UserDB, UserDB.firebase_uid == bindparam("firebase_uid"))
+    .where(ItemDB.id == bindparam("item_id"))
+)
+
 
 def get_current_user(
     token_data: dict = Depends(verify_token),
@@ -41,10 +56,103 @@ def get_current_user(
         HTTPException: 404 if user not found
     """
     firebase_uid = token_data["uid"]
-    user = db.query(UserDB).filter(UserDB.firebase_uid == firebase_uid).first()
+    user = db.scalars(SELECT_USER_BY_FIREBASE_UID, {"firebase_uid": firebase_uid}).first()
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     return user
 
+
+
+def get_current_user_id(
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db),
+) -> str:
+    """
+    Get the current authenticated user's id, without loading the user row.
+    
+    For endpoints that only need the id (participant/ownership checks). The
+    firebase_uid -> id mapping is cached, so warm requests skip the users
+    query entirely; use get_current_user when the UserDB itself is needed.
+    
+    Raises:
+        HTTPException: 404 if user not found
+    """
+    firebase_uid = token_data["uid"]
+    user_id = user_id_by_firebase_uid_cache.get(firebase_uid)
+    if user_id is not None:
+        return user_id
+    
+    user_id = db.scalar(SELECT_USER_ID_BY_FIREBASE_UID, {"firebase_uid": firebase_uid})
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    user_id_by_firebase_uid_cache.set(firebase_uid, user_id)
+    return user_id
+
+
+def get_conversation_or_404(
+    conversation_id: str,
+    db: Session = Depends(get_db),
+) -> ConversationDB:
+    """
+    Load the conversation named by the `conversation_id` path/query parameter.
+    
+    FastAPI caches dependency results per request, so an endpoint and its
+    other dependencies share one lookup.
+    
+    Usage:
+        @app.get("/api/conversations/{conversation_id}")
+        def get_conversation(
+            conversation_id: str,
+            conversation: ConversationDB = Depends(get_conversation_or_404),
+        ):
+            ...
+    
+    Raises:
+        HTTPException: 404 if the conversation does not exist
+    """
+    return get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
+
+
+def get_item_and_current_user_id(
+    item_id: str,
+    token_data: dict = Depends(verify_token),
+    db: Session = Depends(get_db),
+) -> tuple[ItemDB, str]:
+    """
+    Load the item named by the `item_id` path parameter together with the
+    current user's id, in a single query instead of get_current_user + get_or_404.
+    
+    Only the user's id is selected, so no UserDB is hydrated. Ownership
+    checks stay in the endpoints, which word their 403s differently.
+    
+    Usage:
+        @app.delete("/api/items/{item_id}")
+        def delete_item(
+            item_id: str,
+            item_and_user_id: tuple[ItemDB, str] = Depends(get_item_and_current_user_id),
+        ):
+            item, user_id = item_and_user_id
+            ...
+    
+    Raises:
+        HTTPException: 404 if the user or the item is not found (user first,
+        as with get_current_user)
+    """
+    row = db.execute(
+        SELECT_ITEM_AND_USER_ID_BY_FIREBASE_UID,
+        {"firebase_uid": token_data["uid"], "item_id": item_id},
+    ).first()
+    
+    if row is None:
+        # Unknown item; keep reporting a missing user first
+        get_current_user_id(token_data, db)
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    item, user_id = row
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return item, user_id
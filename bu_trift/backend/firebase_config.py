@@ -1,8 +1,8 @@
 import firebase_admin
 from firebase_admin import credentials, auth
 import os
-import json
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +14,10 @@ if not firebase_admin._apps:
     if firebase_service_account_json:
         # Parse JSON string from environment variable (Render deployment)
         try:
-            cred_dict = json.loads(firebase_service_account_json)
-            cred = credentials.Certificate(cred_dict)
+            cred = credentials.Certificate(orjson.loads(firebase_service_account_json))
             firebase_admin.initialize_app(cred)
             logger.info("Firebase Admin SDK initialized from environment variable")
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse FIREBASE_SERVICE_ACCOUNT JSON: {e}")
             raise
         except Exception as e:
@@ -1,11 +1,13 @@
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, WebSocket, WebSocketDisconnect, Query, Request, Response, BackgroundTasks
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketState
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional
 from sqlalchemy.orm import Session
-from database import get_db, engine, Base
+from database import get_db, engine, Base, DATABASE_URL, pool_stats
 from models.item import ItemDB
 from models.user import UserDB
 from models.conversation import ConversationDB
@@ -14,17 +16,35 @@ from models.buy_request import BuyRequestDB
 from models.transaction import TransactionDB
 from models.review import ReviewDB
 import uuid
+import asyncio
 from datetime import datetime
 import os
+import re
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import logging
+import orjson
+import anyio.to_thread
+from cachetools import LRUCache
+from sqlalchemy import Integer, bindparam, delete, exists, func, insert, or_, select, tuple_, update
 from sqlalchemy.exc import SQLAlchemyError
 
 # NEW: import Firebase auth verification
-from auth import verify_token
+from auth import verify_token, warm_signing_keys
+# WebSocket auth helpers (WebSocket endpoints can't use FastAPI dependencies)
+from utils.websocket_auth import verify_websocket_token, get_user_from_firebase_uid
 # NEW: import dependencies for reusable authentication
-from dependencies import get_current_user
+from dependencies import get_current_user, get_current_user_id, get_conversation_or_404, get_item_and_current_user_id
 # NEW: import database utilities
-from utils.db_utils import get_or_404
+from utils.db_utils import get_or_404, dialect_insert, new_id
+from responses import ORJSONResponse, iter_json_array
+from cache import item_cache, user_profile_cache, user_id_by_firebase_uid_cache
+# Rate limiting (per Firebase UID, falling back to client IP)
+from rate_limit import limiter
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+from firebase_admin import auth as firebase_auth
 
 # Ensure firebase_admin initializes
 # Optional Firebase initialization
@@ -42,17 +62,44 @@ from storage import upload_file_to_cloudinary
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Create tables at startup only when asked to. Production schema is created by
+# start.sh (once per deploy, not once per worker); schema changes to existing
+# tables should go through a migration tool such as Alembic, not create_all.
+# Defaults to on for local SQLite so `uvicorn main:app` works out of the box.
+AUTO_CREATE_TABLES = os.getenv(
+    "AUTO_CREATE_TABLES", "1" if DATABASE_URL.startswith("sqlite") else "0"
+) == "1"
+
+
+# Operational endpoints under /debug are hidden unless explicitly enabled
+ENABLE_DEBUG_ENDPOINTS = os.getenv("ENABLE_DEBUG_ENDPOINTS", "") == "1"
+
+# Sync (def) endpoints run on AnyIO's worker threadpool, which defaults to 40
+# threads; every DB-touching endpoint holds one for its whole request. Size it
+# for the expected concurrency (excess threads simply wait on the DB pool).
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "100"))
 
-# Create uploads directory
-upload_dir = "uploads"
-os.makedirs(upload_dir, exist_ok=True)
+# Seconds between sweeps that drop WebSocket connections which closed uncleanly
+WEBSOCKET_REAP_INTERVAL = 30
 
-# Serve uploaded images
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+    reaper = asyncio.create_task(manager.reap_disconnected())
+    # Prefetch Firebase's signing keys in the background; startup doesn't wait
+    warm_keys = asyncio.create_task(run_in_threadpool(warm_signing_keys))
+    yield
+    reaper.cancel()
+    warm_keys.cancel()
+
+
+# orjson encodes responses (including datetimes) in C instead of stdlib json
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS configuration - support both local and production
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
@@ -64,15 +111,18 @@ origins = [
     # Common Render frontend URLs (will be overridden by FRONTEND_URL if set)
     "https://butrift-frontend.onrender.com",
 ]
-# Remove duplicates while preserving order
-origins = list(dict.fromkeys(origins))
+# Remove duplicates; a frozenset also makes Starlette's per-request
+# `origin in allow_origins` check a hash lookup
+origins = frozenset(origins)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists (the frontend only sends these) instead of wildcards
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # ============================
@@ -91,6 +141,9 @@ class ItemCreate(BaseModel):
 
 
 class ItemResponse(BaseModel):
+    # Built straight from ItemDB instances via ItemResponse.model_validate(item)
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     title: str
     description: str
@@ -101,9 +154,14 @@ class ItemResponse(BaseModel):
     status: str
     location: Optional[str]
     is_negotiable: bool
-    created_date: str
+    created_date: datetime
     images: Optional[List[str]]
 
+    @field_validator("images", mode="before")
+    @classmethod
+    def default_images(cls, images):
+        return images or []
+
 
 class ItemStatusUpdate(BaseModel):
     status: str
@@ -126,6 +184,13 @@ class UserRegister(BaseModel):
     display_name: str
     bio: Optional[str] = None
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email):
+        # Normalised once here; the @bu.edu check stays in the endpoint so
+        # clients keep getting a 400 with a plain-string detail
+        return email.strip().lower()
+
 
 class UserUpdate(BaseModel):
     display_name: Optional[str] = None
@@ -139,6 +204,9 @@ class CompleteProfileRequest(BaseModel):
 
 
 class UserResponse(BaseModel):
+    # Built straight from UserDB instances via UserResponse.model_validate(user)
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     email: str
     display_name: str
@@ -147,7 +215,7 @@ class UserResponse(BaseModel):
     bio: Optional[str]
     rating: float
     total_sales: int
-    created_date: str
+    created_date: datetime
 
 
 # Conversation Pydantic models
@@ -161,9 +229,9 @@ class ConversationResponse(BaseModel):
     participant1_id: str
     participant2_id: str
     item_id: str  # Required: item being discussed
-    last_message_at: Optional[str]
-    created_date: str
-    updated_date: str
+    last_message_at: Optional[datetime]
+    created_date: datetime
+    updated_date: datetime
     last_message_snippet: Optional[str] = None
     unread_count: int = 0
     item_title: Optional[str] = None  # For UI display
@@ -176,14 +244,24 @@ class MessageCreate(BaseModel):
     content: str
 
 class MessageResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     conversation_id: str
     sender_id: str
     content: str
     is_read: bool
-    created_date: str
+    created_date: datetime
     message_type: Optional[str] = "text"
     buy_request_id: Optional[str] = None
+    # Only filled in by GET /api/messages?eager=true
+    sender_display_name: Optional[str] = None
+    sender_profile_image_url: Optional[str] = None
+
+    @field_validator("message_type", mode="before")
+    @classmethod
+    def default_message_type(cls, message_type):
+        return message_type or "text"
 
 class MessageUpdate(BaseModel):
     is_read: Optional[bool] = None
@@ -195,14 +273,16 @@ class BuyRequestCreate(BaseModel):
     conversation_id: Optional[str] = None  # Will create if not provided
 
 class BuyRequestResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     item_id: str
     buyer_id: str
     seller_id: str
     conversation_id: str
     status: str
-    created_date: str
-    responded_date: Optional[str] = None
+    created_date: datetime
+    responded_date: Optional[datetime] = None
 
 class BuyRequestUpdate(BaseModel):
     status: str  # "accepted", "rejected", "cancelled"
@@ -216,6 +296,8 @@ class TransactionCreate(BaseModel):
     buy_request_id: Optional[str] = None
 
 class TransactionResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     item_id: str
     buyer_id: str
@@ -227,12 +309,18 @@ class TransactionResponse(BaseModel):
     seller_confirmed: bool
     buyer_cancel_confirmed: bool
     seller_cancel_confirmed: bool
-    meetup_time: Optional[str] = None
+    meetup_time: Optional[datetime] = None
     meetup_place: Optional[str] = None
     meetup_lat: Optional[float] = None
     meetup_lng: Optional[float] = None
-    created_date: str
-    completed_date: Optional[str] = None
+    created_date: datetime
+    completed_date: Optional[datetime] = None
+
+    @field_validator("buyer_cancel_confirmed", "seller_cancel_confirmed", mode="before")
+    @classmethod
+    def default_cancel_confirmed(cls, confirmed):
+        # Rows created before the cancel-confirmation columns existed hold NULL
+        return bool(confirmed)
 
 class TransactionUpdate(BaseModel):
     buyer_confirmed: Optional[bool] = None
@@ -252,6 +340,8 @@ class ReviewCreate(BaseModel):
     comment: Optional[str] = None
 
 class ReviewResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
     id: str
     transaction_id: str
     item_id: str
@@ -260,8 +350,8 @@ class ReviewResponse(BaseModel):
     rating: int
     comment: Optional[str] = None
     response: Optional[str] = None
-    created_date: str
-    updated_date: str
+    created_date: datetime
+    updated_date: datetime
 
 class ReviewUpdate(BaseModel):
     comment: Optional[str] = None
@@ -272,226 +362,392 @@ class ReviewUpdate(BaseModel):
 # Helper Functions
 # ============================
 
-def item_to_response(item: ItemDB) -> dict:
-    return {
-        "id": item.id,
-        "title": item.title,
-        "description": item.description,
-        "price": item.price,
-        "category": item.category,
-        "condition": item.condition,
-        "seller_id": item.seller_id,
-        "status": item.status,
-        "location": item.location,
-        "is_negotiable": item.is_negotiable,
-        "created_date": item.created_date.isoformat(),
-        "images": item.images or [],
-    }
+# Columns projected by list endpoints so rows come back as lightweight tuples
+# instead of fully tracked ORM instances.
+ITEM_RESPONSE_COLUMNS = (
+    ItemDB.id,
+    ItemDB.title,
+    ItemDB.description,
+    ItemDB.price,
+    ItemDB.category,
+    ItemDB.condition,
+    ItemDB.seller_id,
+    ItemDB.status,
+    ItemDB.location,
+    ItemDB.is_negotiable,
+    ItemDB.created_date,
+    ItemDB.images,
+)
 
 
-def user_to_response(user: UserDB) -> dict:
-    return {
-        "id": user.id,
-        "email": user.email,
-        "display_name": user.display_name,
-        "is_verified": user.is_verified,
-        "profile_image_url": user.profile_image_url,
-        "bio": user.bio,
-        "rating": user.rating,
-        "total_sales": user.total_sales,
-        "created_date": user.created_date.isoformat(),
-    }
+# Rows fetched per round trip when streaming item lists
+ITEMS_STREAM_BATCH_SIZE = 500
 
 
-def conversation_to_response(
-    conversation: ConversationDB,
-    current_user_id: str | None = None,
-    db: Session | None = None,
-) -> dict:
-    """Convert ConversationDB to response dictionary with optional unread and last message snippet."""
-    last_message_snippet = None
-    unread_count = 0
+def item_row_to_response(row) -> dict:
+    """Convert a row selected with ITEM_RESPONSE_COLUMNS to a response dictionary"""
+    result = dict(row._mapping)
+    result["images"] = row.images or []
+    return result
 
-    if db and current_user_id:
-        last_message = (
-            db.query(MessageDB)
-            .filter(MessageDB.conversation_id == conversation.id)
-            .order_by(MessageDB.created_date.desc())
-            .first()
-        )
-        if last_message:
-            last_message_snippet = (last_message.content or "")[:120]
-
-        unread_count = (
-            db.query(MessageDB)
-            .filter(
-                MessageDB.conversation_id == conversation.id,
-                MessageDB.sender_id != current_user_id,
-                MessageDB.is_read == False,  # noqa: E712
-            )
-            .count()
-        )
 
-    # Get item details for UI display
-    item_title = None
-    item_image_url = None
-    if db and conversation.item_id:
-        item = db.query(ItemDB).filter(ItemDB.id == conversation.item_id).first()
-        if item:
-            item_title = item.title
-            if item.images and len(item.images) > 0:
-                item_image_url = item.images[0]
-    
+MESSAGE_RESPONSE_COLUMNS = (
+    MessageDB.id,
+    MessageDB.conversation_id,
+    MessageDB.sender_id,
+    MessageDB.content,
+    MessageDB.is_read,
+    MessageDB.created_date,
+    MessageDB.message_type,
+    MessageDB.buy_request_id,
+)
+
+
+# Joined onto MESSAGE_RESPONSE_COLUMNS for GET /api/messages?eager=true
+MESSAGE_SENDER_COLUMNS = (
+    UserDB.display_name.label("sender_display_name"),
+    UserDB.profile_image_url.label("sender_profile_image_url"),
+)
+
+
+def message_row_to_response(row) -> dict:
+    """Convert a row selected with MESSAGE_RESPONSE_COLUMNS (optionally plus
+    MESSAGE_SENDER_COLUMNS) to a response dictionary"""
+    result = dict(row._mapping)
+    result["message_type"] = row.message_type or "text"
+    # Same keys as MessageResponse whether or not the sender was joined
+    result.setdefault("sender_display_name", None)
+    result.setdefault("sender_profile_image_url", None)
+    return result
+
+
+def _conversation_dict(
+    conversation: ConversationDB,
+    last_message_snippet: Optional[str],
+    unread_count: int,
+    item_title: Optional[str],
+    item_images: Optional[list],
+) -> dict:
     return {
         "id": conversation.id,
         "participant1_id": conversation.participant1_id,
         "participant2_id": conversation.participant2_id,
         "item_id": conversation.item_id,
-        "last_message_at": conversation.last_message_at.isoformat() if conversation.last_message_at else None,
-        "created_date": conversation.created_date.isoformat() if conversation.created_date else datetime.now().isoformat(),
-        "updated_date": conversation.updated_date.isoformat() if conversation.updated_date else datetime.now().isoformat(),
+        "last_message_at": conversation.last_message_at,
+        "created_date": conversation.created_date or datetime.now(),
+        "updated_date": conversation.updated_date or datetime.now(),
         "last_message_snippet": last_message_snippet,
         "unread_count": unread_count,
         "item_title": item_title,
-        "item_image_url": item_image_url,
+        "item_image_url": item_images[0] if item_images else None,
     }
 
 
-def pydantic_to_dict(model) -> dict:
-    """Convert Pydantic model to dictionary (supports both v1 and v2)"""
-    if hasattr(model, 'dict'):
-        return model.dict()
-    elif hasattr(model, 'model_dump'):
-        return model.model_dump()
-    else:
-        return dict(model)
+def conversation_to_response(
+    conversation: ConversationDB,
+    current_user_id: str | None = None,
+    db: Session | None = None,
+) -> dict:
+    """
+    Convert ConversationDB to response dictionary. With db and current_user_id,
+    the last message snippet, unread count and item details are loaded in one
+    query (the same statement get_conversations uses for whole lists).
+    """
+    if db and current_user_id:
+        row = db.execute(
+            SELECT_CONVERSATION_SUMMARIES_FOR_USER.where(ConversationDB.id == conversation.id),
+            {"user_id": current_user_id},
+        ).first()
+        if row is not None:
+            return conversation_summary_to_response(row)
+    return _conversation_dict(conversation, None, 0, None, None)
 
-def message_to_response(message: MessageDB) -> dict:
-    """Convert MessageDB to response dictionary"""
-    result = {
-        "id": message.id,
-        "conversation_id": message.conversation_id,
-        "sender_id": message.sender_id,
-        "content": message.content,
-        "is_read": message.is_read,
-        "created_date": message.created_date.isoformat() if message.created_date else datetime.now().isoformat(),
-    }
-    # Add optional fields if they exist
-    if hasattr(message, "message_type"):
-        result["message_type"] = message.message_type or "text"
-    if hasattr(message, "buy_request_id"):
-        result["buy_request_id"] = message.buy_request_id
-    return result
 
-def buy_request_to_response(buy_request: BuyRequestDB) -> BuyRequestResponse:
-    return BuyRequestResponse(
-        id=buy_request.id,
-        item_id=buy_request.item_id,
-        buyer_id=buy_request.buyer_id,
-        seller_id=buy_request.seller_id,
-        conversation_id=buy_request.conversation_id,
-        status=buy_request.status,
-        created_date=buy_request.created_date.isoformat() if buy_request.created_date else datetime.now().isoformat(),
-        responded_date=buy_request.responded_date.isoformat() if buy_request.responded_date else None,
+def _build_conversation_summaries_select():
+    """
+    Select a user's conversations together with their last message, unread
+    count and item details as correlated subqueries / an outer join, so a list
+    of N conversations costs one round trip instead of 3N + 1.
+    Rows unpack as (ConversationDB, last_message_content, unread_count, item_title, item_images).
+    """
+    user_id = bindparam("user_id")
+    last_message_content = (
+        select(MessageDB.content)
+        .where(MessageDB.conversation_id == ConversationDB.id)
+        .order_by(MessageDB.created_date.desc())
+        .limit(1)
+        .correlate(ConversationDB)
+        .scalar_subquery()
     )
-
-def transaction_to_response(transaction: TransactionDB) -> TransactionResponse:
-    return TransactionResponse(
-        id=transaction.id,
-        item_id=transaction.item_id,
-        buyer_id=transaction.buyer_id,
-        seller_id=transaction.seller_id,
-        conversation_id=transaction.conversation_id,
-        buy_request_id=transaction.buy_request_id,
-        status=transaction.status,
-        buyer_confirmed=transaction.buyer_confirmed,
-        seller_confirmed=transaction.seller_confirmed,
-        buyer_cancel_confirmed=transaction.buyer_cancel_confirmed if hasattr(transaction, 'buyer_cancel_confirmed') else False,
-        seller_cancel_confirmed=transaction.seller_cancel_confirmed if hasattr(transaction, 'seller_cancel_confirmed') else False,
-        meetup_time=transaction.meetup_time.isoformat() if transaction.meetup_time else None,
-        meetup_place=transaction.meetup_place,
-        meetup_lat=transaction.meetup_lat,
-        meetup_lng=transaction.meetup_lng,
-        created_date=transaction.created_date.isoformat() if transaction.created_date else datetime.now().isoformat(),
-        completed_date=transaction.completed_date.isoformat() if transaction.completed_date else None,
+    unread_count = (
+        select(func.count(MessageDB.id))
+        .where(
+            MessageDB.conversation_id == ConversationDB.id,
+            MessageDB.sender_id != user_id,
+            MessageDB.is_read == False,  # noqa: E712
+        )
+        .correlate(ConversationDB)
+        .scalar_subquery()
     )
+    return (
+        select(
+            ConversationDB,
+            last_message_content.label("last_message_content"),
+            unread_count.label("unread_count"),
+            ItemDB.title.label("item_title"),
+            ItemDB.images.label("item_images"),
+        )
+        .outerjoin(ItemDB, ItemDB.id == ConversationDB.item_id)
+        .where((ConversationDB.participant1_id == user_id) | (ConversationDB.participant2_id == user_id))
+        # id breaks ties, so keyset pages split equal timestamps deterministically
+        .order_by(ConversationDB.last_message_at.desc().nullslast(), ConversationDB.id.desc())
+    )
+
+
+# Optional equality filters accepted by GET /api/items, in query-string order
+ITEM_FILTER_COLUMNS = ("seller_id", "category", "condition", "status")
 
 
-def review_to_response(review: ReviewDB) -> ReviewResponse:
-    return ReviewResponse(
-        id=review.id,
-        transaction_id=review.transaction_id,
-        item_id=review.item_id,
-        reviewer_id=review.reviewer_id,
-        reviewee_id=review.reviewee_id,
-        rating=review.rating,
-        comment=review.comment,
-        response=review.response,
-        created_date=review.created_date.isoformat() if review.created_date else datetime.now().isoformat(),
-        updated_date=review.updated_date.isoformat() if review.updated_date else datetime.now().isoformat(),
+@lru_cache(maxsize=None)
+def _build_items_select(filters: tuple, keyset: bool, limited: bool, keyset_id: bool = False):
+    """
+    GET /api/items statement for one filter combination (at most 96 shapes).
+
+    Built once per shape and parameterised with bindparam, like the hot-path
+    statements below, so repeat requests only bind values.
+    """
+    stmt = select(*ITEM_RESPONSE_COLUMNS).where(
+        *(getattr(ItemDB, name) == bindparam(name) for name in filters)
+    )
+    if keyset or limited:
+        # Keyset page, newest first: pass the last item's created_date and id
+        # as `before` / `before_id` to get the next page. created_date alone
+        # isn't unique, so id breaks ties between items listed in the same instant
+        if keyset and keyset_id:
+            stmt = stmt.where(
+                tuple_(ItemDB.created_date, ItemDB.id)
+                < tuple_(
+                    bindparam("before", type_=ItemDB.created_date.type),
+                    bindparam("before_id", type_=ItemDB.id.type),
+                )
+            )
+        elif keyset:
+            stmt = stmt.where(ItemDB.created_date < bindparam("before"))
+        stmt = stmt.order_by(ItemDB.created_date.desc(), ItemDB.id.desc())
+        if limited:
+            stmt = stmt.limit(bindparam("limit", type_=Integer))
+    return stmt
+
+
+# Upper bound for the optional `limit` on keyset-paginated list endpoints
+MAX_PAGE_SIZE = 200
+
+# Hot-path statements are built once at import time and parameterised with
+# bindparam, so requests skip rebuilding the expression tree and always hit
+# the same compiled-statement cache entry.
+SELECT_CONVERSATION_SUMMARIES_FOR_USER = _build_conversation_summaries_select()
+SELECT_MESSAGES_BY_CONVERSATION = (
+    select(*MESSAGE_RESPONSE_COLUMNS)
+    .where(MessageDB.conversation_id == bindparam("conversation_id"))
+    .order_by(MessageDB.created_date.asc(), MessageDB.id.asc())
+)
+# Either participant order, for one item
+SELECT_CONVERSATION_BETWEEN = select(ConversationDB).where(
+    ConversationDB.item_id == bindparam("item_id"),
+    (
+        (ConversationDB.participant1_id == bindparam("user_a"))
+        & (ConversationDB.participant2_id == bindparam("user_b"))
+    ) | (
+        (ConversationDB.participant1_id == bindparam("user_b"))
+        & (ConversationDB.participant2_id == bindparam("user_a"))
+    ),
+).limit(1)
+SELECT_BUY_REQUESTS_BY_CONVERSATION_ITEM = (
+    select(BuyRequestDB)
+    .where(
+        BuyRequestDB.conversation_id == bindparam("conversation_id"),
+        BuyRequestDB.item_id == bindparam("item_id"),
+    )
+    .order_by(BuyRequestDB.created_date.desc())
+)
+SELECT_TRANSACTIONS_BY_CONVERSATION = (
+    select(TransactionDB)
+    .where(TransactionDB.conversation_id == bindparam("conversation_id"))
+    .order_by(TransactionDB.created_date.desc())
+)
+SELECT_IS_CONVERSATION_PARTICIPANT = select(exists().where(
+    ConversationDB.id == bindparam("conversation_id"),
+    (ConversationDB.participant1_id == bindparam("user_id"))
+    | (ConversationDB.participant2_id == bindparam("user_id")),
+))
+
+
+def is_conversation_participant(db: Session, conversation_id: str, user_id: str) -> bool:
+    """Whether user_id takes part in the conversation, without loading the conversation row"""
+    return db.scalar(
+        SELECT_IS_CONVERSATION_PARTICIPANT,
+        {"conversation_id": conversation_id, "user_id": user_id},
     )
 
+
+def conversation_summary_to_response(row) -> dict:
+    """Convert a row from SELECT_CONVERSATION_SUMMARIES_FOR_USER to a response dictionary"""
+    conversation, last_message_content, unread_count, item_title, item_images = row
+    snippet = last_message_content[:120] if last_message_content is not None else None
+    return _conversation_dict(conversation, snippet, unread_count or 0, item_title, item_images)
+
+
+def pydantic_to_dict(model) -> dict:
+    """Convert a response model to a JSON-safe dictionary (for WebSocket payloads)"""
+    return model.model_dump(mode="json")
+
+def message_to_response(message: MessageDB) -> dict:
+    """Convert MessageDB to a JSON-safe response dictionary (also sent over WebSockets)"""
+    return MessageResponse.model_validate(message).model_dump(mode="json")
+
+def _find_conversation(db: Session, user_a: str, user_b: str, item_id: str) -> Optional[ConversationDB]:
+    """Find the conversation about item_id between two users, in either participant order."""
+    return db.scalars(
+        SELECT_CONVERSATION_BETWEEN,
+        {"item_id": item_id, "user_a": user_a, "user_b": user_b},
+    ).first()
+
+
+# Databases (by URL) where uq_conversation_pair_item has been seen. An index
+# doesn't disappear once created, so only positive checks are remembered.
+_conversation_pair_index_found: set = set()
+
+
+def _has_conversation_pair_index(db: Session) -> bool:
+    """
+    Whether the unordered-pair unique index uq_conversation_pair_item exists.
+
+    Only Postgres can have it. create_all adds it to new databases, but older
+    ones only get it once migrations/001_conversation_pair_unique.sql has run.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    url = str(bind.url)
+    if url not in _conversation_pair_index_found:
+        if not db.scalar(select(func.to_regclass("uq_conversation_pair_item").is_not(None))):
+            return False
+        _conversation_pair_index_found.add(url)
+    return True
+
+
+def find_or_create_conversation(
+    db: Session, participant1_id: str, participant2_id: str, item_id: str
+) -> tuple[ConversationDB, bool]:
+    """
+    Return (conversation, created) for the item conversation between two users.
+
+    The insert uses ON CONFLICT DO NOTHING against any unique index -
+    unique_conversation_per_item and, once it exists, uq_conversation_pair_item,
+    which also covers the reversed participant order - so two racing requests
+    cannot both create one; the loser re-reads the row the winner inserted.
+    Does not commit.
+
+    With uq_conversation_pair_item in place the insert is attempted first, so
+    a new conversation costs one round trip. Without it (SQLite, or Postgres
+    before the migration) the reversed pair is looked up before inserting.
+    """
+    if not _has_conversation_pair_index(db):
+        existing = _find_conversation(db, participant1_id, participant2_id, item_id)
+        if existing:
+            return existing, False
+
+    new_conversation = db.execute(
+        dialect_insert(db, ConversationDB)
+        .values(
+            id=new_id(),
+            participant1_id=participant1_id,
+            participant2_id=participant2_id,
+            item_id=item_id,
+        )
+        .on_conflict_do_nothing()
+        .returning(ConversationDB)
+    ).scalar_one_or_none()
+    if new_conversation is None:
+        return _find_conversation(db, participant1_id, participant2_id, item_id), False
+    return new_conversation, True
+
+
 def calculate_user_rating(user_id: str, db: Session) -> float:
     """Calculate average rating for a user based on all their reviews."""
-    reviews = db.query(ReviewDB).filter(ReviewDB.reviewee_id == user_id).all()
-    if not reviews:
-        return 0.0
-    total_rating = sum(review.rating for review in reviews)
-    return round(total_rating / len(reviews), 2)
+    # AVG in SQL returns one value instead of hydrating every ReviewDB row
+    average = db.scalar(
+        select(func.coalesce(func.avg(ReviewDB.rating), 0.0))
+        .where(ReviewDB.reviewee_id == user_id)
+    )
+    return round(float(average), 2)
+
+# Non-empty local part without whitespace or extra "@", then exactly "@bu.edu"
+_BU_EMAIL_RE = re.compile(r"[^@\s]+@bu\.edu", re.IGNORECASE)
+
 
 def validate_bu_email(email: str) -> bool:
-    return email.lower().endswith("@bu.edu")
+    return _BU_EMAIL_RE.fullmatch(email) is not None
 
 
 # ============================
 # Image Upload (Authenticated)
 # ============================
 
+ALLOWED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+MAX_UPLOAD_SIZE = 5 * 1024 * 1024  # 5MB in bytes
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
 @app.post("/api/upload-image")
+@limiter.limit("30/minute")
 async def upload_image(
+    request: Request,
+    response: Response,  # slowapi adds the rate limit headers here
     file: UploadFile = File(...),
-    user: UserDB = Depends(get_current_user),  # Use dependency injection - authenticated users only
+    user_id: str = Depends(get_current_user_id),  # Authenticated users only (cached uid -> id lookup)
 ):
     """
     Upload an image file to Cloudinary.
     Returns the public URL of the uploaded file.
     Only authenticated users can upload images.
     """
-    # Validate file type
-    allowed_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in allowed_extensions:
+    # Validate file type (extension and declared content type)
+    file_ext = os.path.splitext(file.filename or "")[1].lower()
+    if file_ext not in ALLOWED_IMAGE_EXTENSIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_extensions)}"
+            detail=f"Invalid file type. Allowed types: {', '.join(sorted(ALLOWED_IMAGE_EXTENSIONS))}"
         )
-    
-    # Validate file size (5MB limit)
-    MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
+    if file.content_type and not file.content_type.startswith("image/"):
+        raise HTTPException(status_code=400, detail="Invalid content type. File must be an image")
+    
+    # Validate file size. The multipart parser already spooled the upload to a
+    # temp file and recorded its size; only fall back to a chunked scan (never
+    # buffering the whole file) when the size is unknown.
+    size = file.size
+    if size is None:
+        size = 0
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_UPLOAD_SIZE:
+                break
+        await file.seek(0)
+    if size > MAX_UPLOAD_SIZE:
         raise HTTPException(
-            status_code=400,
+            status_code=413,
             detail=f"File size exceeds maximum allowed size of 5MB"
         )
     
-    # Sanitize filename to prevent path traversal
-    import re
-    safe_filename = re.sub(r'[^a-zA-Z0-9._-]', '_', file.filename)
-    # Add timestamp to ensure uniqueness
-    import time
-    safe_filename = f"{int(time.time())}_{safe_filename}"
-    
-    # Ensure filename doesn't exceed reasonable length
-    # Cloudinary allows up to 255 characters for public_id
-    if len(safe_filename) > 255:
-        name, ext = os.path.splitext(safe_filename)
-        safe_filename = name[:250] + ext
+    # Random filename: no path traversal, no collisions between users' uploads
+    safe_filename = f"{uuid.uuid4().hex}{file_ext}"
     
     try:
-        # Upload to Cloudinary (synchronous function, no await needed)
-        public_url = upload_file_to_cloudinary(
-            file_content=content,
+        # Cloudinary's SDK is blocking: stream the spooled file from a worker
+        # thread so the event loop keeps serving other requests meanwhile
+        public_url = await run_in_threadpool(
+            upload_file_to_cloudinary,
+            file_content=file.file,
             filename=safe_filename,
             folder="butrift/uploads"
         )
@@ -516,39 +772,73 @@ def root():
     return {"message": "BUThrift API is running!"}
 
 
+@app.get("/debug/pool", include_in_schema=False)
+def debug_pool():
+    """DB connection pool usage; only exposed when ENABLE_DEBUG_ENDPOINTS=1."""
+    if not ENABLE_DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return pool_stats()
+
+
 @app.get("/api/items", response_model=List[ItemResponse])
 def get_items(
     seller_id: Optional[str] = None,
     category: Optional[str] = None,
     condition: Optional[str] = None,
     status: Optional[str] = None,
+    before: Optional[datetime] = Query(None, description="Keyset cursor: only items listed before this"),
+    before_id: Optional[str] = Query(None, description="With `before`: id of the last item already loaded, so items sharing its timestamp aren't skipped or repeated"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size: the newest `limit` items (omit for all)"),
     db: Session = Depends(get_db),
 ):
-    query = db.query(ItemDB)
-
-    if seller_id:
-        query = query.filter(ItemDB.seller_id == seller_id)
-    if category:
-        query = query.filter(ItemDB.category == category)
-    if condition:
-        query = query.filter(ItemDB.condition == condition)
-    if status:
-        query = query.filter(ItemDB.status == status)
-
-    items = query.all()
-    return [item_to_response(item) for item in items]
+    params = {
+        name: value
+        for name, value in zip(ITEM_FILTER_COLUMNS, (seller_id, category, condition, status))
+        if value
+    }
+    keyset_id = before is not None and before_id is not None
+    stmt = _build_items_select(tuple(params), before is not None, limit is not None, keyset_id)
+    if before is not None:
+        params["before"] = before
+    if keyset_id:
+        params["before_id"] = before_id
+    if limit is not None:
+        params["limit"] = limit
+
+    # Stream rows in batches (server-side cursor on Postgres) so memory stays
+    # bounded as the catalogue grows. Rows come straight from the DB in response
+    # shape, so skip re-validating them against ItemResponse (response_model is
+    # kept for the OpenAPI schema).
+    rows = db.execute(
+        stmt,
+        params,
+        execution_options={"stream_results": True, "yield_per": ITEMS_STREAM_BATCH_SIZE},
+    )
+    return StreamingResponse(
+        iter_json_array((item_row_to_response(row) for row in rows), ITEMS_STREAM_BATCH_SIZE),
+        media_type="application/json",
+    )
 
 
 @app.get("/api/items/{item_id}", response_model=ItemResponse)
 def get_item(item_id: str, db: Session = Depends(get_db)):
+    cached = item_cache.get(item_id)
+    if cached is not None:
+        return cached
+
     item = get_or_404(ItemDB, item_id, db, "Item not found")
-    return item_to_response(item)
+    response = ItemResponse.model_validate(item).model_dump(mode="json")
+    item_cache.set(item_id, response)
+    return response
 
 
 @app.post("/api/items", response_model=ItemResponse)
+@limiter.limit("60/minute")
 def create_item(
+    request: Request,
+    response: Response,  # slowapi adds the rate limit headers here
     item: ItemCreate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Only the id is needed
     db: Session = Depends(get_db),
 ):
     # Validate price
@@ -556,25 +846,30 @@ def create_item(
         raise HTTPException(status_code=400, detail="Price must be greater than 0")
 
     try:
-        new_item = ItemDB(
-            id=str(uuid.uuid4()),
-            title=item.title,
-            description=item.description,
-            price=item.price,
-            category=item.category,
-            condition=item.condition,
-            seller_id=user.id,  # Seller is authenticated user
-            status="available",
-            location=item.location,
-            is_negotiable=item.is_negotiable,
-            created_date=datetime.now(),
-            images=item.images or [],
-        )
+        # INSERT ... RETURNING gets server defaults (created_date) back in the
+        # same round trip, so no refresh SELECT is needed afterwards
+        new_item = db.execute(
+            insert(ItemDB)
+            .values(
+                id=new_id(),
+                title=item.title,
+                description=item.description,
+                price=item.price,
+                category=item.category,
+                condition=item.condition,
+                seller_id=user_id,  # Seller is authenticated user
+                status="available",
+                location=item.location,
+                is_negotiable=item.is_negotiable,
+                images=item.images or [],
+            )
+            .returning(ItemDB)
+        ).scalar_one()
 
-        db.add(new_item)
+        # Build the response before commit expires the instance's attributes
+        item_response = ItemResponse.model_validate(new_item)
         db.commit()
-        db.refresh(new_item)
-        return item_to_response(new_item)
+        return item_response
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create item: {str(e)}")
@@ -584,41 +879,49 @@ def create_item(
 def update_item(
     item_id: str,
     updates: ItemUpdate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    item_and_user_id: tuple[ItemDB, str] = Depends(get_item_and_current_user_id),  # One query for both
     db: Session = Depends(get_db),
 ):
     """
     Update an existing item listing. Only the seller can update their own listing.
     """
-    item = get_or_404(ItemDB, item_id, db, "Item not found")
+    item, user_id = item_and_user_id
 
-    if item.seller_id != user.id:
+    if item.seller_id != user_id:
         raise HTTPException(status_code=403, detail="You can only edit your own listings")
 
     if updates.price is not None and updates.price <= 0:
         raise HTTPException(status_code=400, detail="Price must be greater than 0")
 
-    try:
-        if updates.title is not None:
-            item.title = updates.title
-        if updates.description is not None:
-            item.description = updates.description
-        if updates.price is not None:
-            item.price = updates.price
-        if updates.category is not None:
-            item.category = updates.category
-        if updates.condition is not None:
-            item.condition = updates.condition
-        if updates.location is not None:
-            item.location = updates.location
-        if updates.is_negotiable is not None:
-            item.is_negotiable = updates.is_negotiable
-        if updates.images is not None:
-            item.images = updates.images
+    # Fields left out (or sent as null) keep their current value
+    values = {
+        field: value
+        for field, value in updates.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+    if not values:
+        return ItemResponse.model_validate(item)
 
+    try:
+        # One UPDATE ... RETURNING writes only the provided columns and returns
+        # the updated row, so no flush of dirty attributes or refresh SELECT
+        updated = db.execute(
+            update(ItemDB)
+            .where(ItemDB.id == item_id, ItemDB.seller_id == user_id)
+            .values(**values)
+            .returning(ItemDB),
+            # The dependency already loaded this item; overwrite its stale
+            # attributes with the returned row
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).scalar_one_or_none()
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+
+        # Build the response before commit expires the instance's attributes
+        response = ItemResponse.model_validate(updated)
         db.commit()
-        db.refresh(item)
-        return item_to_response(item)
+        item_cache.invalidate(item_id)
+        return response
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update item: {str(e)}")
@@ -628,7 +931,7 @@ def update_item(
 def update_item_status(
     item_id: str,
     status_update: ItemStatusUpdate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    item_and_user_id: tuple[ItemDB, str] = Depends(get_item_and_current_user_id),  # One query for both
     db: Session = Depends(get_db),
 ):
     """Update item status (available/sold/reserved). Only the seller can update."""
@@ -639,16 +942,17 @@ def update_item_status(
             detail=f"Invalid status. Allowed: {', '.join(sorted(allowed_statuses))}"
         )
 
-    item = get_or_404(ItemDB, item_id, db, "Item not found")
+    item, user_id = item_and_user_id
 
-    if item.seller_id != user.id:
+    if item.seller_id != user_id:
         raise HTTPException(status_code=403, detail="You can only update your own listings")
 
     try:
         item.status = status_update.status
         db.commit()
+        item_cache.invalidate(item_id)
         db.refresh(item)
-        return item_to_response(item)
+        return ItemResponse.model_validate(item)
     except SQLAlchemyError as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update item: {str(e)}")
@@ -657,20 +961,21 @@ def update_item_status(
 @app.delete("/api/items/{item_id}")
 def delete_item(
     item_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    item_and_user_id: tuple[ItemDB, str] = Depends(get_item_and_current_user_id),  # One query for both
     db: Session = Depends(get_db),
 ):
     """
     Delete an item listing. Only the seller who created the item can delete it.
     """
-    item = get_or_404(ItemDB, item_id, db, "Item not found")
+    item, user_id = item_and_user_id
 
-    if item.seller_id != user.id:
+    if item.seller_id != user_id:
         raise HTTPException(status_code=403, detail="You can only remove your own listings")
 
     try:
         db.delete(item)
         db.commit()
+        item_cache.invalidate(item_id)
         return {"message": "Item deleted successfully"}
     except SQLAlchemyError as e:
         db.rollback()
@@ -687,37 +992,43 @@ def create_profile(
     token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db),
 ):
-    if not validate_bu_email(user_data.email):
+    email = user_data.email
+    if not validate_bu_email(email):
         raise HTTPException(400, "Email must be @bu.edu")
 
     firebase_uid = token_data["uid"]
 
-    existing = db.query(UserDB).filter(
-        (UserDB.email == user_data.email.lower()) |
+    # SELECT EXISTS(...) answers the question without loading a UserDB row
+    existing = db.scalar(select(exists().where(
+        (UserDB.email == email) |
         (UserDB.firebase_uid == firebase_uid)
-    ).first()
+    )))
 
     if existing:
         raise HTTPException(400, "User already exists")
 
     try:
-        new_user = UserDB(
-            id=str(uuid.uuid4()),
-            firebase_uid=firebase_uid,
-            email=user_data.email.lower(),
-            display_name=user_data.display_name,
-            is_verified=True,
-            bio=user_data.bio,
-            rating=0.0,
-            total_sales=0,
-            created_date=datetime.now(),
-        )
+        # INSERT ... RETURNING gets server defaults (created_date) back in the
+        # same round trip, so no refresh SELECT is needed afterwards
+        new_user = db.execute(
+            insert(UserDB)
+            .values(
+                id=new_id(),
+                firebase_uid=firebase_uid,
+                email=email,
+                display_name=user_data.display_name,
+                is_verified=True,
+                bio=user_data.bio,
+                rating=0.0,
+                total_sales=0,
+            )
+            .returning(UserDB)
+        ).scalar_one()
 
-        db.add(new_user)
+        # Build the response before commit expires the instance's attributes
+        response = UserResponse.model_validate(new_user)
         db.commit()
-        db.refresh(new_user)
-
-        return user_to_response(new_user)
+        return response
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create profile: {str(e)}")
@@ -725,11 +1036,22 @@ def create_profile(
 
 @app.get("/api/users/me", response_model=UserResponse)
 def get_current_user_endpoint(
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    token_data: dict = Depends(verify_token),
     db: Session = Depends(get_db),
 ):
-    """Get current authenticated user's profile"""
-    return user_to_response(user)
+    """Get current authenticated user's profile, served from the profile cache when warm"""
+    firebase_uid = token_data["uid"]
+    user_id = user_id_by_firebase_uid_cache.get(firebase_uid)
+    if user_id is not None:
+        cached = user_profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+    user = get_current_user(token_data, db)
+    response = UserResponse.model_validate(user).model_dump(mode="json")
+    user_id_by_firebase_uid_cache.set(firebase_uid, user.id)
+    user_profile_cache.set(user.id, response)
+    return response
 
 
 @app.put("/api/users/me", response_model=UserResponse)
@@ -750,8 +1072,9 @@ def update_current_user(
 
         db.commit()
         db.refresh(user)
+        user_profile_cache.invalidate(user.id)
 
-        return user_to_response(user)
+        return UserResponse.model_validate(user)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update profile: {str(e)}")
@@ -775,8 +1098,6 @@ def complete_profile(
     
     try:
         # Set password in Firebase using Admin SDK
-        from firebase_admin import auth as firebase_auth
-        
         firebase_auth.update_user(
             firebase_uid,
             password=profile_data.password
@@ -791,10 +1112,11 @@ def complete_profile(
         
         db.commit()
         db.refresh(user)
+        user_profile_cache.invalidate(user.id)
         
         logger.info(f"Profile completed for user {user.id} ({user.email})")
         
-        return user_to_response(user)
+        return UserResponse.model_validate(user)
     except Exception as e:
         db.rollback()
         logger.error(f"Error completing profile: {e}")
@@ -812,41 +1134,50 @@ def delete_current_user(
     """
     firebase_uid = user.firebase_uid  # Get firebase_uid from user object
     user_id = user.id
+    email = user.email
     
     try:
-        # Delete all related data first
-        # 1. Delete all items by this user
-        items = db.query(ItemDB).filter(ItemDB.seller_id == user_id).all()
-        for item in items:
-            db.delete(item)
-        
-        # 2. Delete all conversations where user is a participant
-        conversations = db.query(ConversationDB).filter(
+        # Delete all related data first, as set-based DELETEs: a fixed handful
+        # of statements however many items/conversations/messages the user has.
+        # Nothing deleted here is used from the session afterwards, so skip
+        # synchronizing it.
+        bulk = {"synchronize_session": False}
+        is_participant = (
             (ConversationDB.participant1_id == user_id) |
             (ConversationDB.participant2_id == user_id)
-        ).all()
+        )
+        user_conversation_ids = select(ConversationDB.id).where(is_participant)
+        
+        # 1. Delete all messages in the user's conversations
+        db.execute(
+            delete(MessageDB).where(MessageDB.conversation_id.in_(user_conversation_ids)),
+            execution_options=bulk,
+        )
         
-        # Delete all messages in these conversations
-        for conversation in conversations:
-            messages = db.query(MessageDB).filter(MessageDB.conversation_id == conversation.id).all()
-            for message in messages:
-                db.delete(message)
-            db.delete(conversation)
+        # 2. Delete all messages sent by this user (in case any remain)
+        db.execute(delete(MessageDB).where(MessageDB.sender_id == user_id), execution_options=bulk)
         
-        # 3. Delete all messages sent by this user (in case any remain)
-        remaining_messages = db.query(MessageDB).filter(MessageDB.sender_id == user_id).all()
-        for message in remaining_messages:
-            db.delete(message)
+        # 3. Delete all conversations where user is a participant
+        db.execute(delete(ConversationDB).where(is_participant), execution_options=bulk)
         
-        # 4. Delete user from database
-        db.delete(user)
+        # 4. Delete all items by this user (ids kept for cache invalidation)
+        item_ids = db.scalars(
+            delete(ItemDB).where(ItemDB.seller_id == user_id).returning(ItemDB.id),
+            execution_options=bulk,
+        ).all()
+        
+        # 5. Delete user from database
+        db.execute(delete(UserDB).where(UserDB.id == user_id), execution_options=bulk)
         db.commit()
+        user_profile_cache.invalidate(user_id)
+        user_id_by_firebase_uid_cache.invalidate(firebase_uid)
+        for item_id in item_ids:
+            item_cache.invalidate(item_id)
         
-        logger.info(f"User {user_id} ({user.email}) and all related data deleted from database")
+        logger.info(f"User {user_id} ({email}) and all related data deleted from database")
         
-        # 5. Delete user from Firebase
+        # 6. Delete user from Firebase
         try:
-            from firebase_admin import auth as firebase_auth
             firebase_auth.delete_user(firebase_uid)
             logger.info(f"Firebase user {firebase_uid} deleted")
         except Exception as firebase_error:
@@ -863,100 +1194,190 @@ def delete_current_user(
 
 @app.get("/api/users/{user_id}", response_model=UserResponse)
 def get_user_profile(user_id: str, db: Session = Depends(get_db)):
+    """Public profile, served from a 60s cache that writes to the user invalidate."""
+    cached = user_profile_cache.get(user_id)
+    if cached is not None:
+        return cached
     user = get_or_404(UserDB, user_id, db, "User not found")
-    return user_to_response(user)
+    response = UserResponse.model_validate(user).model_dump(mode="json")
+    user_profile_cache.set(user_id, response)
+    return response
 
 # ==========================
 # WebSocket Connection Manager
 # ==========================
 
-# Store active WebSocket connections
+def load_participant_ids(where, *columns):
+    """
+    Fetch a conversation's or transaction's participant IDs for a broadcast.
+
+    Broadcasts run after the request's session is closed (and WebSockets
+    hold none), so this checks a connection out only for the one SELECT.
+    """
+    from database import SessionLocal
+    with SessionLocal() as db:
+        return db.execute(select(*columns).where(where)).first()
+
+
+def load_websocket_user_id(firebase_uid: str) -> Optional[str]:
+    """
+    Resolve a WebSocket client's user id from its Firebase UID.
+
+    Uses a short-lived session that is closed before the socket starts
+    listening, so open WebSockets never hold a pooled connection.
+    """
+    from database import SessionLocal
+    with SessionLocal() as db:
+        user = get_user_from_firebase_uid(firebase_uid, db)
+        return user.id if user else None
+
+
+# Store active WebSocket connections. These live in this process only, so
+# broadcasts reach just the sockets held by this worker (start.sh runs one).
 class ConnectionManager:
     def __init__(self):
-        # Dictionary: user_id -> list of WebSocket connections
-        self.active_connections: dict[str, list[WebSocket]] = {}
+        # Dictionary: user_id -> set of WebSocket connections (O(1) add/discard)
+        self.active_connections: dict[str, set[WebSocket]] = {}
+        # conversation_id -> (participant1_id, participant2_id); bounded LRU
+        self._conversation_participants: LRUCache = LRUCache(maxsize=10_000)
+        # transaction_id -> (buyer_id, seller_id); bounded LRU
+        self._transaction_participants: LRUCache = LRUCache(maxsize=10_000)
     
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept WebSocket connection and store it"""
         await websocket.accept()
-        if user_id not in self.active_connections:
-            self.active_connections[user_id] = []
-        self.active_connections[user_id].append(websocket)
+        self.active_connections.setdefault(user_id, set()).add(websocket)
     
     def disconnect(self, websocket: WebSocket, user_id: str):
         """Remove WebSocket connection when client disconnects"""
-        if user_id in self.active_connections:
-            self.active_connections[user_id].remove(websocket)
-            if not self.active_connections[user_id]:
+        connections = self.active_connections.get(user_id)
+        if connections is not None:
+            connections.discard(websocket)
+            if not connections:
                 del self.active_connections[user_id]
     
-    async def send_personal_message(self, message: dict, user_id: str):
-        """Send message to a specific user's WebSocket connections"""
-        if user_id in self.active_connections:
-            logger.info(f"Sending message type '{message.get('type', 'unknown')}' to user {user_id}, {len(self.active_connections[user_id])} connection(s)")
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                    logger.info(f"Successfully sent message to user {user_id}")
-                except Exception as e:
-                    logger.error(f"Failed to send message to user {user_id}: {e}")
-        else:
+    @staticmethod
+    def encode(message: dict) -> str:
+        """Serialize a message once so it can be fanned out to many sockets"""
+        return orjson.dumps(message).decode()
+    
+    async def send_personal_message(self, message: dict, user_id: str, payload: str = None):
+        """Send message to all of a user's WebSocket connections concurrently
+        
+        payload is the already-encoded message; broadcasts pass it so the
+        dict is serialized once rather than once per socket.
+        """
+        connections = self.active_connections.get(user_id)
+        if not connections:
             logger.warning(f"User {user_id} has no active WebSocket connections - message type: {message.get('type', 'unknown')}")
+            return
+        
+        if payload is None:
+            payload = self.encode(message)
+        # Snapshot the set: connections may (dis)connect while we await the sends
+        connections = tuple(connections)
+        logger.info(f"Sending message type '{message.get('type', 'unknown')}' to user {user_id}, {len(connections)} connection(s)")
+        # A slow or dead socket must not hold up the user's other tabs/devices.
+        # Text frames, as send_json used, since clients JSON.parse event.data.
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to send message to user {user_id}: {result}")
+                # Drop the dead socket now rather than waiting for the reaper
+                self.disconnect(connection, user_id)
+            else:
+                logger.info(f"Successfully sent message to user {user_id}")
+    
+    def prune_disconnected(self) -> int:
+        """Drop sockets that are no longer connected; returns how many were removed"""
+        removed = 0
+        for user_id, connections in list(self.active_connections.items()):
+            for connection in tuple(connections):
+                if connection.client_state != WebSocketState.CONNECTED:
+                    self.disconnect(connection, user_id)
+                    removed += 1
+        return removed
+    
+    async def reap_disconnected(self, interval: float = WEBSOCKET_REAP_INTERVAL):
+        """Periodically prune sockets that closed without a clean disconnect"""
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.prune_disconnected()
+            if removed:
+                logger.info(f"Reaped {removed} closed WebSocket connection(s)")
     
-    async def broadcast_to_conversation(self, message: dict, conversation_id: str, sender_id: str, db: Session = None, participant1_id: str = None, participant2_id: str = None):
+    async def broadcast_to_conversation(self, message: dict, conversation_id: str, sender_id: str, participant1_id: str = None, participant2_id: str = None):
         """Send message to all participants in a conversation (except sender)
         
         Optimized: Accepts participant IDs directly to avoid redundant DB query.
-        Falls back to DB query if participant IDs not provided (backward compatibility).
+        Falls back to the participant cache, then a short-lived session of its
+        own, if participant IDs are not provided.
         """
-        participants = None
         if participant1_id and participant2_id:
             # Use provided participant IDs (avoid DB query)
-            participants = [participant1_id, participant2_id]
-        elif db:
-            # Fallback to DB query if IDs not provided
-            conversation = db.query(ConversationDB).filter(ConversationDB.id == conversation_id).first()
-            if not conversation:
-                return
-            participants = [conversation.participant1_id, conversation.participant2_id]
+            participants = (participant1_id, participant2_id)
+            self._conversation_participants[conversation_id] = participants
+        elif conversation_id in self._conversation_participants:
+            participants = self._conversation_participants[conversation_id]
         else:
-            logger.warning(f"Cannot broadcast to conversation {conversation_id}: no participant IDs or DB session provided")
-            return
-        
-        # Send to all participants except sender
-        for participant_id in participants:
-            if participant_id != sender_id:
-                await self.send_personal_message(message, participant_id)
-    
-    async def broadcast_to_transaction(self, message: dict, transaction_id: str, sender_id: str, db: Session = None, buyer_id: str = None, seller_id: str = None):
+            # Participants never change, so cache them for later broadcasts
+            row = await run_in_threadpool(
+                load_participant_ids,
+                ConversationDB.id == conversation_id,
+                ConversationDB.participant1_id,
+                ConversationDB.participant2_id,
+            )
+            if row is None:
+                return
+            participants = tuple(row)
+            self._conversation_participants[conversation_id] = participants
+        
+        # Send to all participants except sender, concurrently
+        payload = self.encode(message)
+        await asyncio.gather(*(
+            self.send_personal_message(message, participant_id, payload)
+            for participant_id in participants
+            if participant_id != sender_id
+        ))
+    
+    async def broadcast_to_transaction(self, message: dict, transaction_id: str, sender_id: str, buyer_id: str = None, seller_id: str = None):
         """Send message to both buyer and seller of a transaction (except sender)
         
         Optimized: Accepts buyer/seller IDs directly to avoid redundant DB query.
-        Falls back to DB query if IDs not provided (backward compatibility).
+        Falls back to the participant cache, then a short-lived session of its
+        own, if IDs are not provided.
         """
-        participants = None
         if buyer_id and seller_id:
             # Use provided participant IDs (avoid DB query)
-            participants = [buyer_id, seller_id]
-        elif db:
-            # Fallback to DB query if IDs not provided
-            from models.transaction import TransactionDB
-            transaction = db.query(TransactionDB).filter(TransactionDB.id == transaction_id).first()
-            if not transaction:
+            participants = (buyer_id, seller_id)
+            self._transaction_participants[transaction_id] = participants
+        elif transaction_id in self._transaction_participants:
+            participants = self._transaction_participants[transaction_id]
+        else:
+            # Buyer and seller never change, so cache them for later broadcasts
+            row = await run_in_threadpool(
+                load_participant_ids,
+                TransactionDB.id == transaction_id,
+                TransactionDB.buyer_id,
+                TransactionDB.seller_id,
+            )
+            if row is None:
                 logger.warning(f"Transaction {transaction_id} not found for broadcast")
                 return
-            participants = [transaction.buyer_id, transaction.seller_id]
-        else:
-            logger.warning(f"Cannot broadcast to transaction {transaction_id}: no participant IDs or DB session provided")
-            return
+            participants = tuple(row)
+            self._transaction_participants[transaction_id] = participants
         
         logger.info(f"Broadcasting transaction update to participants: {participants}, sender: {sender_id}")
         
         # Send to both participants except sender
+        payload = self.encode(message)
         for participant_id in participants:
             if participant_id != sender_id:
                 logger.info(f"Sending transaction update to user {participant_id}")
-                await self.send_personal_message(message, participant_id)
+                await self.send_personal_message(message, participant_id, payload)
             else:
                 logger.info(f"Skipping sender {sender_id}")
 
@@ -978,35 +1399,22 @@ async def websocket_endpoint(
     Note: WebSocket endpoints cannot use FastAPI dependencies directly,
     so we use utility functions from utils.websocket_auth for authentication.
     """
-    # Import WebSocket auth utilities (can't use FastAPI dependencies for WebSocket)
-    from utils.websocket_auth import verify_websocket_token, get_user_from_firebase_uid
-    
     # Verify token from query parameter
     token_data = await verify_websocket_token(token)
     if not token_data:
         await websocket.close(code=1008, reason="Invalid authentication token")
         return
     
-    # Verify user_id matches token - use a short-lived database session
-    # CRITICAL: Close session immediately after authentication to prevent connection pool exhaustion
-    from database import SessionLocal
-    db = SessionLocal()
-    user = None
-    try:
-        # Use helper function to reduce duplication
-        user = get_user_from_firebase_uid(token_data["uid"], db)
-        if not user:
-            await websocket.close(code=1008, reason="User not found")
-            return
-        
-        if user.id != user_id:
-            await websocket.close(code=1008, reason="User ID mismatch")
-            return
-    finally:
-        # IMPORTANT: Always close database session immediately after authentication
-        # Don't keep it open for the entire WebSocket connection lifetime
-        # This prevents connection pool exhaustion when multiple WebSocket connections exist
-        db.close()
+    # Verify user_id matches token. The lookup runs on the threadpool, so a
+    # slow query or an exhausted pool (pool_timeout) can't stall the event loop
+    token_user_id = await run_in_threadpool(load_websocket_user_id, token_data["uid"])
+    if token_user_id is None:
+        await websocket.close(code=1008, reason="User not found")
+        return
+    
+    if token_user_id != user_id:
+        await websocket.close(code=1008, reason="User ID mismatch")
+        return
     
     # Now connect to WebSocket (no database session needed for connection lifetime)
     await manager.connect(websocket, user_id)
@@ -1018,6 +1426,9 @@ async def websocket_endpoint(
             # Optional: Process incoming messages from client
             # For now, we just keep the connection alive
     except WebSocketDisconnect:
+        pass
+    finally:
+        # Also runs on abnormal closes, so the set never keeps a dead socket
         manager.disconnect(websocket, user_id)
 
 # ==========================
@@ -1028,13 +1439,13 @@ async def websocket_endpoint(
 @app.post("/api/conversations", response_model=ConversationResponse)
 def create_conversation(
     conversation: ConversationCreate,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Create a new conversation between two users"""
     
     # Verify that current user is participant1_id
-    if conversation.participant1_id != current_user.id:
+    if conversation.participant1_id != current_user_id:
         raise HTTPException(status_code=403, detail="You can only create conversations as yourself")
     
     # Verify that participant2 exists
@@ -1051,35 +1462,17 @@ def create_conversation(
     # Verify item exists
     item = get_or_404(ItemDB, conversation.item_id, db, "Item not found")
     
-    # Check if conversation already exists for THIS specific item + participants
-    existing = db.query(ConversationDB).filter(
-        ConversationDB.item_id == conversation.item_id,  # Item-specific check
-        (
-            ((ConversationDB.participant1_id == conversation.participant1_id) &
-             (ConversationDB.participant2_id == conversation.participant2_id)) |
-            ((ConversationDB.participant1_id == conversation.participant2_id) &
-             (ConversationDB.participant2_id == conversation.participant1_id))
-        )
-    ).first()
-    
-    if existing:
-        # Return existing conversation for this item instead of creating duplicate
-        return conversation_to_response(existing, current_user_id=current_user.id, db=db)
-    
     try:
-        # Create new conversation
-        new_conversation = ConversationDB(
-            id=str(uuid.uuid4()),
-            participant1_id=conversation.participant1_id,
-            participant2_id=conversation.participant2_id,
-            item_id=conversation.item_id,
+        existing_or_new, created = find_or_create_conversation(
+            db, conversation.participant1_id, conversation.participant2_id, conversation.item_id
         )
+        if not created:
+            # Return existing conversation for this item instead of creating duplicate
+            return conversation_to_response(existing_or_new, current_user_id=current_user_id, db=db)
         
-        db.add(new_conversation)
+        response = conversation_to_response(existing_or_new)
         db.commit()
-        db.refresh(new_conversation)
-        
-        return conversation_to_response(new_conversation)
+        return response
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create conversation: {str(e)}")
@@ -1087,48 +1480,62 @@ def create_conversation(
 @app.get("/api/conversations", response_model=List[ConversationResponse])
 def get_conversations(
     user_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    before: Optional[datetime] = Query(None, description="Keyset cursor: the last page's final last_message_at (omit it if that was null)"),
+    before_id: Optional[str] = Query(None, description="Keyset cursor: the last page's final conversation id"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size (omit for all)"),
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Get all conversations for a specific user"""
     # Verify that user can only access their own conversations
-    if user_id != current_user.id:
+    if user_id != current_user_id:
         raise HTTPException(status_code=403, detail="You can only access your own conversations")
     
-    conversations = db.query(ConversationDB).filter(
-        (ConversationDB.participant1_id == user_id) |
-        (ConversationDB.participant2_id == user_id)
-    ).order_by(ConversationDB.last_message_at.desc().nullslast()).all()
-    
-    return [conversation_to_response(conv, current_user_id=user_id, db=db) for conv in conversations]
+    stmt = SELECT_CONVERSATION_SUMMARIES_FOR_USER
+    # Keyset page in (last_message_at DESC NULLS LAST, id DESC) order.
+    # Conversations without messages sort last, so they follow every dated
+    # cursor, and a cursor with only before_id pages among them by id.
+    if before is not None:
+        if before_id is not None:
+            older = tuple_(ConversationDB.last_message_at, ConversationDB.id) < (before, before_id)
+        else:
+            older = ConversationDB.last_message_at < before
+        stmt = stmt.where(or_(older, ConversationDB.last_message_at.is_(None)))
+    elif before_id is not None:
+        stmt = stmt.where(ConversationDB.last_message_at.is_(None), ConversationDB.id < before_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    rows = db.execute(stmt, {"user_id": user_id}).all()
+    
+    # Rows are already response-shaped, so skip re-validating every dict
+    # against response_model; orjson encodes the datetimes natively
+    return ORJSONResponse([conversation_summary_to_response(row) for row in rows])
 
 @app.get("/api/conversations/{conversation_id}", response_model=ConversationResponse)
 def get_conversation(
     conversation_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db),
 ):
     """Get a specific conversation by ID"""
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
     # Verify user is a participant
-    if current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if current_user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
-    return conversation_to_response(conversation, current_user_id=current_user.id, db=db)
+    return conversation_to_response(conversation, current_user_id=current_user_id, db=db)
 
 @app.put("/api/conversations/{conversation_id}", response_model=ConversationResponse)
 def update_conversation(
     conversation_id: str,
     item_id: Optional[str] = None,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db)
 ):
     """Update conversation (e.g., update item_id or last_message_at)"""
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
     # Verify user is a participant
-    if current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if current_user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     try:
@@ -1137,7 +1544,7 @@ def update_conversation(
         
         db.commit()
         db.refresh(conversation)
-        return conversation_to_response(conversation, current_user_id=current_user.id, db=db)
+        return conversation_to_response(conversation, current_user_id=current_user_id, db=db)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update conversation: {str(e)}")
@@ -1145,14 +1552,13 @@ def update_conversation(
 @app.delete("/api/conversations/{conversation_id}")
 def delete_conversation(
     conversation_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db)
 ):
     """Delete a conversation and all its messages"""
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
     # Verify user is a participant
-    if current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if current_user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     try:
@@ -1165,9 +1571,10 @@ def delete_conversation(
 
 # Messages CRUD
 @app.post("/api/messages", response_model=MessageResponse)
-async def create_message(
+def create_message(
     message: MessageCreate,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Create a new message in a conversation and broadcast via WebSocket"""
@@ -1180,49 +1587,62 @@ async def create_message(
         raise HTTPException(status_code=400, detail="Message content cannot exceed 5000 characters")
     
     # Verify sender is authenticated user
-    if message.sender_id != current_user.id:
+    if message.sender_id != current_user_id:
         raise HTTPException(status_code=403, detail="You can only send messages as yourself")
     
-    # Verify conversation exists
-    conversation = get_or_404(ConversationDB, message.conversation_id, db, "Conversation not found")
+    # Verify conversation exists; only the participant ids are needed, so
+    # select those two columns instead of loading a ConversationDB
+    participants = db.execute(
+        select(ConversationDB.participant1_id, ConversationDB.participant2_id)
+        .where(ConversationDB.id == message.conversation_id)
+    ).first()
+    if participants is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    participant1_id, participant2_id = participants
     
     # Verify sender is a participant
-    if message.sender_id not in [conversation.participant1_id, conversation.participant2_id]:
+    if message.sender_id not in (participant1_id, participant2_id):
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     try:
-        # Create new message
-        new_message = MessageDB(
-            id=str(uuid.uuid4()),
-            conversation_id=message.conversation_id,
-            sender_id=message.sender_id,
-            content=content,  # Use validated content
-            is_read=False,
+        # INSERT ... RETURNING gives back id/created_date without a refresh
+        new_message = db.execute(
+            insert(MessageDB)
+            .values(
+                id=new_id(),
+                conversation_id=message.conversation_id,
+                sender_id=message.sender_id,
+                content=content,  # Use validated content
+                is_read=False,
+                message_type="text",
+            )
+            .returning(MessageDB)
+        ).scalar_one()
+        
+        # Update conversation's last_message_at in the same transaction
+        db.execute(
+            update(ConversationDB)
+            .where(ConversationDB.id == message.conversation_id)
+            .values(last_message_at=datetime.now())
         )
         
-        db.add(new_message)
-        
-        # Update conversation's last_message_at
-        conversation.last_message_at = datetime.now()
-        
-        db.commit()
-        db.refresh(new_message)
-        
-        # Convert to response format
+        # Convert to response format before commit expires the instance
         message_response = message_to_response(new_message)
+        db.commit()
         
-        # Broadcast new message via WebSocket to conversation participants
-        # Pass participant IDs directly to avoid redundant DB query
-        await manager.broadcast_to_conversation(
+        # Broadcast new message via WebSocket after the response is sent, so
+        # slow receivers don't hold up the sender's POST. Participant IDs are
+        # passed directly; the request's session is closed by then.
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "new_message",
                 "data": message_response
             },
             message.conversation_id,
             message.sender_id,
-            db,
-            participant1_id=conversation.participant1_id,
-            participant2_id=conversation.participant2_id
+            participant1_id=participant1_id,
+            participant2_id=participant2_id
         )
         
         return message_response
@@ -1233,35 +1653,61 @@ async def create_message(
 @app.get("/api/messages", response_model=List[MessageResponse])
 def get_messages(
     conversation_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    before: Optional[datetime] = Query(None, description="Keyset cursor: only messages created before this"),
+    before_id: Optional[str] = Query(None, description="With `before`: id of the oldest message already loaded, so messages sharing its timestamp aren't skipped or repeated"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size: the newest `limit` messages (omit for all)"),
+    eager: bool = Query(False, description="Include each sender's display name and profile image"),
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db),
 ):
     """Get all messages in a conversation"""
-    # Verify conversation exists
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
     # Verify user is a participant
-    if current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if current_user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
-    messages = db.query(MessageDB).filter(
-        MessageDB.conversation_id == conversation_id
-    ).order_by(MessageDB.created_date.asc()).all()
+    if before is None and limit is None and not eager:
+        rows = db.execute(SELECT_MESSAGES_BY_CONVERSATION, {"conversation_id": conversation_id}).all()
+    else:
+        stmt = select(*MESSAGE_RESPONSE_COLUMNS).where(MessageDB.conversation_id == conversation_id)
+        if eager:
+            # Sender details in the same round trip, so clients don't follow
+            # up with a GET /api/users/{id} per distinct sender
+            stmt = stmt.add_columns(*MESSAGE_SENDER_COLUMNS).outerjoin(
+                UserDB, UserDB.id == MessageDB.sender_id
+            )
+        if before is None and limit is None:
+            rows = db.execute(stmt.order_by(MessageDB.created_date.asc(), MessageDB.id.asc())).all()
+        else:
+            # Keyset page: walk (conversation_id, created_date, id) backwards from
+            # the cursor, then return the page oldest-first like the unpaginated
+            # list. created_date alone isn't unique, so messages sent in the same
+            # instant are split across pages by id (UUIDv7, so still time-ordered)
+            if before is not None:
+                if before_id is not None:
+                    stmt = stmt.where(tuple_(MessageDB.created_date, MessageDB.id) < (before, before_id))
+                else:
+                    stmt = stmt.where(MessageDB.created_date < before)
+            stmt = stmt.order_by(MessageDB.created_date.desc(), MessageDB.id.desc())
+            if limit is not None:
+                stmt = stmt.limit(limit)
+            rows = db.execute(stmt).all()[::-1]
     
-    return [message_to_response(msg) for msg in messages]
+    # Rows are already response-shaped, so skip re-validating every dict
+    # against response_model; orjson encodes the datetimes natively
+    return ORJSONResponse([message_row_to_response(row) for row in rows])
 
 @app.get("/api/messages/{message_id}", response_model=MessageResponse)
 def get_message(
     message_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db)
 ):
     """Get a specific message by ID"""
     message = get_or_404(MessageDB, message_id, db, "Message not found")
     
     # Verify user is a participant in the conversation
-    conversation = db.query(ConversationDB).filter(ConversationDB.id == message.conversation_id).first()
-    if conversation and current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if not is_conversation_participant(db, message.conversation_id, current_user_id):
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     return message_to_response(message)
@@ -1270,15 +1716,14 @@ def get_message(
 def update_message(
     message_id: str,
     message_update: MessageUpdate,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db)
 ):
     """Update a message (e.g., mark as read)"""
     message = get_or_404(MessageDB, message_id, db, "Message not found")
     
     # Verify user is a participant in the conversation
-    conversation = db.query(ConversationDB).filter(ConversationDB.id == message.conversation_id).first()
-    if conversation and current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if not is_conversation_participant(db, message.conversation_id, current_user_id):
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     try:
@@ -1296,32 +1741,35 @@ def update_message(
 def mark_conversation_read(
     conversation_id: str,
     user_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Mark all messages in a conversation as read for a specific user"""
     # Verify user_id matches authenticated user
-    if user_id != current_user.id:
+    if user_id != current_user_id:
         raise HTTPException(status_code=403, detail="You can only mark your own messages as read")
     
     # Verify conversation exists and user is a participant
     conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
     
-    if current_user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if current_user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You are not a participant in this conversation")
     
     try:
-        messages = db.query(MessageDB).filter(
-            MessageDB.conversation_id == conversation_id,
-            MessageDB.sender_id != user_id,  # Only mark messages NOT sent by this user
-            MessageDB.is_read == False
-        ).all()
-        
-        for message in messages:
-            message.is_read = True
+        # Single UPDATE instead of loading and flushing every unread row
+        result = db.execute(
+            update(MessageDB)
+            .where(
+                MessageDB.conversation_id == conversation_id,
+                MessageDB.sender_id != user_id,  # Only mark messages NOT sent by this user
+                MessageDB.is_read == False,  # noqa: E712
+            )
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
         
         db.commit()
-        return {"message": f"Marked {len(messages)} messages as read"}
+        return {"message": f"Marked {result.rowcount} messages as read"}
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to mark messages as read: {str(e)}")
@@ -1329,14 +1777,14 @@ def mark_conversation_read(
 @app.delete("/api/messages/{message_id}")
 def delete_message(
     message_id: str,
-    current_user: UserDB = Depends(get_current_user),  # Use dependency injection
+    current_user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db)
 ):
     """Delete a message"""
     message = get_or_404(MessageDB, message_id, db, "Message not found")
     
     # Only allow sender to delete their own messages
-    if message.sender_id != current_user.id:
+    if message.sender_id != current_user_id:
         raise HTTPException(status_code=403, detail="You can only delete your own messages")
     
     try:
@@ -1352,25 +1800,26 @@ def delete_message(
 # ============================
 
 @app.post("/api/buy-requests", response_model=BuyRequestResponse)
-async def create_buy_request(
+def create_buy_request(
     request_data: BuyRequestCreate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Create a buy request for an item. Creates conversation if it doesn't exist."""
     item = get_or_404(ItemDB, request_data.item_id, db, "Item not found")
     
-    if item.seller_id == user.id:
+    if item.seller_id == user_id:
         raise HTTPException(status_code=400, detail="You cannot request to buy your own item")
     
     if item.status != "available":
         raise HTTPException(status_code=400, detail=f"Item is {item.status} and cannot be requested")
     
-    existing = db.query(BuyRequestDB).filter(
+    existing = db.scalar(select(exists().where(
         BuyRequestDB.item_id == request_data.item_id,
-        BuyRequestDB.buyer_id == user.id,
+        BuyRequestDB.buyer_id == user_id,
         BuyRequestDB.status.in_(["pending", "accepted"])
-    ).first()
+    )))
     
     if existing:
         raise HTTPException(status_code=400, detail="You already have a pending or accepted request for this item")
@@ -1380,7 +1829,7 @@ async def create_buy_request(
         
         # If conversation_id is provided, validate it matches this item
         if conversation_id:
-            existing_conv = db.query(ConversationDB).filter(ConversationDB.id == conversation_id).first()
+            existing_conv = db.get(ConversationDB, conversation_id)
             if existing_conv:
                 # Validate the conversation is for THIS item
                 if existing_conv.item_id != item.id:
@@ -1388,40 +1837,21 @@ async def create_buy_request(
                     conversation_id = None
                 else:
                     # Validate participants match
-                    if not ((existing_conv.participant1_id == user.id and existing_conv.participant2_id == item.seller_id) or
-                            (existing_conv.participant1_id == item.seller_id and existing_conv.participant2_id == user.id)):
+                    if not ((existing_conv.participant1_id == user_id and existing_conv.participant2_id == item.seller_id) or
+                            (existing_conv.participant1_id == item.seller_id and existing_conv.participant2_id == user_id)):
                         # Participants don't match - ignore it
                         conversation_id = None
         
         # Find or create conversation for THIS specific item
         if not conversation_id:
-            # Find conversation for THIS specific item + participants
-            existing_conv = db.query(ConversationDB).filter(
-                ConversationDB.item_id == item.id,  # Item-specific check
-                (
-                    ((ConversationDB.participant1_id == user.id) & (ConversationDB.participant2_id == item.seller_id)) |
-                    ((ConversationDB.participant1_id == item.seller_id) & (ConversationDB.participant2_id == user.id))
-                )
-            ).first()
-            
-            if existing_conv:
-                conversation_id = existing_conv.id
-            else:
-                # Create new conversation for this specific item
-                new_conv = ConversationDB(
-                    id=str(uuid.uuid4()),
-                    participant1_id=user.id,
-                    participant2_id=item.seller_id,
-                    item_id=item.id,  # Required: item-specific
-                )
-                db.add(new_conv)
-                db.flush()
-                conversation_id = new_conv.id
+            # Find or create the conversation for THIS specific item + participants
+            conv, _ = find_or_create_conversation(db, user_id, item.seller_id, item.id)
+            conversation_id = conv.id
         
         buy_request = BuyRequestDB(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             item_id=item.id,
-            buyer_id=user.id,
+            buyer_id=user_id,
             seller_id=item.seller_id,
             conversation_id=conversation_id,
             status="pending"
@@ -1430,9 +1860,9 @@ async def create_buy_request(
         db.flush()
         
         buy_request_message = MessageDB(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             conversation_id=conversation_id,
-            sender_id=user.id,
+            sender_id=user_id,
             content=f"Buy request for: {item.title}",
             message_type="buy_request",
             buy_request_id=buy_request.id,
@@ -1440,7 +1870,7 @@ async def create_buy_request(
         )
         db.add(buy_request_message)
         
-        conversation = db.query(ConversationDB).filter(ConversationDB.id == conversation_id).first()
+        conversation = db.get(ConversationDB, conversation_id)
         if conversation:
             conversation.last_message_at = datetime.now()
         
@@ -1449,29 +1879,33 @@ async def create_buy_request(
         db.refresh(buy_request_message)
         
         # Broadcast buy request update and new message via WebSocket
-        buy_request_response = buy_request_to_response(buy_request)
+        buy_request_response = BuyRequestResponse.model_validate(buy_request)
         message_response = message_to_response(buy_request_message)
         
         # Broadcast buy request update to conversation participants
-        await manager.broadcast_to_conversation(
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "buy_request_update",
                 "data": pydantic_to_dict(buy_request_response)
             },
             conversation_id,
-            user.id,
-            db
+            user_id,
+            participant1_id=buy_request_response.buyer_id,
+            participant2_id=buy_request_response.seller_id,
         )
         
         # Broadcast new message to conversation participants
-        await manager.broadcast_to_conversation(
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "new_message",
                 "data": message_response
             },
             conversation_id,
-            user.id,
-            db
+            user_id,
+            participant1_id=buy_request_response.buyer_id,
+            participant2_id=buy_request_response.seller_id,
         )
         
         return buy_request_response
@@ -1481,15 +1915,16 @@ async def create_buy_request(
         raise HTTPException(status_code=500, detail=f"Failed to create buy request: {str(e)}")
 
 @app.patch("/api/buy-requests/{request_id}/accept")
-async def accept_buy_request(
+def accept_buy_request(
     request_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Accept a buy request and automatically create a transaction."""
     buy_request = get_or_404(BuyRequestDB, request_id, db, "Buy request not found")
     
-    if buy_request.seller_id != user.id:
+    if buy_request.seller_id != user_id:
         raise HTTPException(status_code=403, detail="Only the seller can accept buy requests")
     
     if buy_request.status != "pending":
@@ -1500,10 +1935,10 @@ async def accept_buy_request(
     if item.status != "available":
         raise HTTPException(status_code=400, detail=f"Item is {item.status} and cannot be purchased")
     
-    existing_transaction = db.query(TransactionDB).filter(
+    existing_transaction = db.scalar(select(exists().where(
         TransactionDB.item_id == buy_request.item_id,
         TransactionDB.status == "in_progress"
-    ).first()
+    )))
     
     if existing_transaction:
         raise HTTPException(status_code=400, detail="Item already has an in-progress transaction")
@@ -1523,7 +1958,7 @@ async def accept_buy_request(
             req.responded_date = datetime.now()
         
         transaction = TransactionDB(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             item_id=buy_request.item_id,
             buyer_id=buy_request.buyer_id,
             seller_id=buy_request.seller_id,
@@ -1535,40 +1970,46 @@ async def accept_buy_request(
         )
         db.add(transaction)
         item.status = "reserved"
+        item_id = item.id
         
         # Update conversation timestamp without creating a message
-        conversation = db.query(ConversationDB).filter(ConversationDB.id == buy_request.conversation_id).first()
+        conversation = db.get(ConversationDB, buy_request.conversation_id)
         if conversation:
             conversation.last_message_at = datetime.now()
         
         db.commit()
+        item_cache.invalidate(item_id)
         db.refresh(buy_request)
         db.refresh(transaction)
         
         # Broadcast buy request update and new transaction via WebSocket
-        buy_request_response = buy_request_to_response(buy_request)
-        transaction_response = transaction_to_response(transaction)
+        buy_request_response = BuyRequestResponse.model_validate(buy_request)
+        transaction_response = TransactionResponse.model_validate(transaction)
         
         # Broadcast to conversation participants (buy request update)
-        await manager.broadcast_to_conversation(
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "buy_request_update",
                 "data": pydantic_to_dict(buy_request_response)
             },
             buy_request.conversation_id,
-            user.id,
-            db
+            user_id,
+            participant1_id=buy_request_response.buyer_id,
+            participant2_id=buy_request_response.seller_id,
         )
         
         # Broadcast to transaction participants (new transaction created)
-        await manager.broadcast_to_transaction(
+        background_tasks.add_task(
+            manager.broadcast_to_transaction,
             {
                 "type": "transaction_created",
                 "data": pydantic_to_dict(transaction_response)
             },
             transaction.id,
-            user.id,
-            db
+            user_id,
+            buyer_id=transaction_response.buyer_id,
+            seller_id=transaction_response.seller_id,
         )
         
         return {
@@ -1581,15 +2022,16 @@ async def accept_buy_request(
         raise HTTPException(status_code=500, detail=f"Failed to accept buy request: {str(e)}")
 
 @app.patch("/api/buy-requests/{request_id}/reject", response_model=BuyRequestResponse)
-async def reject_buy_request(
+def reject_buy_request(
     request_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Reject a buy request."""
     buy_request = get_or_404(BuyRequestDB, request_id, db, "Buy request not found")
     
-    if buy_request.seller_id != user.id:
+    if buy_request.seller_id != user_id:
         raise HTTPException(status_code=403, detail="Only the seller can reject buy requests")
     
     if buy_request.status != "pending":
@@ -1600,7 +2042,7 @@ async def reject_buy_request(
         buy_request.responded_date = datetime.now()
         
         # Update conversation timestamp without creating a message
-        conversation = db.query(ConversationDB).filter(ConversationDB.id == buy_request.conversation_id).first()
+        conversation = db.get(ConversationDB, buy_request.conversation_id)
         if conversation:
             conversation.last_message_at = datetime.now()
         
@@ -1608,15 +2050,17 @@ async def reject_buy_request(
         db.refresh(buy_request)
         
         # Broadcast buy request update via WebSocket
-        buy_request_response = buy_request_to_response(buy_request)
-        await manager.broadcast_to_conversation(
+        buy_request_response = BuyRequestResponse.model_validate(buy_request)
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "buy_request_update",
                 "data": pydantic_to_dict(buy_request_response)
             },
             buy_request.conversation_id,
-            user.id,
-            db
+            user_id,
+            participant1_id=buy_request_response.buyer_id,
+            participant2_id=buy_request_response.seller_id,
         )
         
         return buy_request_response
@@ -1625,15 +2069,16 @@ async def reject_buy_request(
         raise HTTPException(status_code=500, detail=f"Failed to reject buy request: {str(e)}")
 
 @app.patch("/api/buy-requests/{request_id}/cancel", response_model=BuyRequestResponse)
-async def cancel_buy_request(
+def cancel_buy_request(
     request_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Cancel a buy request (buyer only)."""
     buy_request = get_or_404(BuyRequestDB, request_id, db, "Buy request not found")
     
-    if buy_request.buyer_id != user.id:
+    if buy_request.buyer_id != user_id:
         raise HTTPException(status_code=403, detail="Only the buyer can cancel buy requests")
     
     if buy_request.status != "pending":
@@ -1646,15 +2091,17 @@ async def cancel_buy_request(
         db.refresh(buy_request)
         
         # Broadcast buy request update via WebSocket
-        buy_request_response = buy_request_to_response(buy_request)
-        await manager.broadcast_to_conversation(
+        buy_request_response = BuyRequestResponse.model_validate(buy_request)
+        background_tasks.add_task(
+            manager.broadcast_to_conversation,
             {
                 "type": "buy_request_update",
                 "data": pydantic_to_dict(buy_request_response)
             },
             buy_request.conversation_id,
-            user.id,
-            db
+            user_id,
+            participant1_id=buy_request_response.buyer_id,
+            participant2_id=buy_request_response.seller_id,
         )
         
         return buy_request_response
@@ -1665,37 +2112,36 @@ async def cancel_buy_request(
 @app.get("/api/buy-requests/by-conversation/{conversation_id}", response_model=List[BuyRequestResponse])
 def get_buy_requests_by_conversation(
     conversation_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db),
 ):
     """Get all buy requests for a conversation."""
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
-    if user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You can only view buy requests for your own conversations")
     
     # Only return buy requests that match the conversation's item_id
     # This ensures item-specific conversations only show relevant buy requests
-    requests = db.query(BuyRequestDB).filter(
-        BuyRequestDB.conversation_id == conversation_id,
-        BuyRequestDB.item_id == conversation.item_id  # Filter by conversation's item_id
-    ).order_by(BuyRequestDB.created_date.desc()).all()
+    requests = db.scalars(
+        SELECT_BUY_REQUESTS_BY_CONVERSATION_ITEM,
+        {"conversation_id": conversation_id, "item_id": conversation.item_id},
+    ).all()
     
-    return [buy_request_to_response(req) for req in requests]
+    return [BuyRequestResponse.model_validate(req) for req in requests]
 
 @app.get("/api/buy-requests/{request_id}", response_model=BuyRequestResponse)
 def get_buy_request(
     request_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Get a specific buy request."""
     buy_request = get_or_404(BuyRequestDB, request_id, db, "Buy request not found")
     
-    if user.id not in [buy_request.buyer_id, buy_request.seller_id]:
+    if user_id not in [buy_request.buyer_id, buy_request.seller_id]:
         raise HTTPException(status_code=403, detail="You can only view your own buy requests")
     
-    return buy_request_to_response(buy_request)
+    return BuyRequestResponse.model_validate(buy_request)
 
 # ============================
 # Transaction Endpoints
@@ -1704,21 +2150,22 @@ def get_buy_request(
 @app.get("/api/transactions/{transaction_id}", response_model=TransactionResponse)
 def get_transaction(
     transaction_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Get a specific transaction."""
     transaction = get_or_404(TransactionDB, transaction_id, db, "Transaction not found")
     
-    if user.id not in [transaction.buyer_id, transaction.seller_id]:
+    if user_id not in [transaction.buyer_id, transaction.seller_id]:
         raise HTTPException(status_code=403, detail="You can only view your own transactions")
     
-    return transaction_to_response(transaction)
+    return TransactionResponse.model_validate(transaction)
 
 @app.post("/api/transactions/create-with-appointment", response_model=TransactionResponse)
-async def create_transaction_with_appointment(
+def create_transaction_with_appointment(
     request_data: dict,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Create a transaction directly with appointment details (no buy request needed)."""
@@ -1739,15 +2186,15 @@ async def create_transaction_with_appointment(
     # Verify conversation exists and user is participant
     conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
     
-    if user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You must be a participant in this conversation")
     
     if conversation.item_id != item_id:
         raise HTTPException(status_code=400, detail="Conversation is not for this item")
     
     # Determine if user is buyer or seller
-    is_seller = user.id == item.seller_id
-    is_buyer = user.id != item.seller_id
+    is_seller = user_id == item.seller_id
+    is_buyer = user_id != item.seller_id
     
     if not is_seller and not is_buyer:
         raise HTTPException(status_code=403, detail="You must be either the buyer or seller for this item")
@@ -1765,7 +2212,7 @@ async def create_transaction_with_appointment(
         
         if existing_transaction:
             # Update existing transaction with appointment details
-            if user.id not in [existing_transaction.buyer_id, existing_transaction.seller_id]:
+            if user_id not in [existing_transaction.buyer_id, existing_transaction.seller_id]:
                 raise HTTPException(status_code=403, detail="You are not authorized to update this transaction")
             
             existing_transaction.meetup_time = meetup_datetime
@@ -1778,28 +2225,28 @@ async def create_transaction_with_appointment(
             db.refresh(existing_transaction)
             
             # Broadcast transaction update via WebSocket
-            transaction_response = transaction_to_response(existing_transaction)
+            transaction_response = TransactionResponse.model_validate(existing_transaction)
             # Pass participant IDs directly to avoid redundant DB queries
-            await manager.broadcast_to_transaction(
+            background_tasks.add_task(
+                manager.broadcast_to_transaction,
                 {
                     "type": "transaction_update",
                     "data": pydantic_to_dict(transaction_response)
                 },
                 existing_transaction.id,
-                user.id,
-                db,
+                user_id,
                 buyer_id=existing_transaction.buyer_id,
                 seller_id=existing_transaction.seller_id
             )
             
-            await manager.broadcast_to_conversation(
+            background_tasks.add_task(
+                manager.broadcast_to_conversation,
                 {
                     "type": "transaction_update",
                     "data": pydantic_to_dict(transaction_response)
                 },
                 conversation_id,
-                user.id,
-                db,
+                user_id,
                 participant1_id=conversation.participant1_id,
                 participant2_id=conversation.participant2_id
             )
@@ -1811,21 +2258,21 @@ async def create_transaction_with_appointment(
                 raise HTTPException(status_code=400, detail=f"Item is {item.status} and cannot be purchased")
             
             # Determine buyer and seller
-            buyer_id = user.id if is_buyer else None
-            seller_id = user.id if is_seller else item.seller_id
+            buyer_id = user_id if is_buyer else None
+            seller_id = user_id if is_seller else item.seller_id
             
             # If seller is setting up, we need to find the other participant as buyer
             if is_seller:
                 # The other participant in conversation is the buyer
-                buyer_id = conversation.participant1_id if conversation.participant1_id != user.id else conversation.participant2_id
-                seller_id = user.id
+                buyer_id = conversation.participant1_id if conversation.participant1_id != user_id else conversation.participant2_id
+                seller_id = user_id
             else:
                 # Buyer is setting up
-                buyer_id = user.id
+                buyer_id = user_id
                 seller_id = item.seller_id
             
             transaction = TransactionDB(
-                id=str(uuid.uuid4()),
+                id=new_id(),
                 item_id=item_id,
                 buyer_id=buyer_id,
                 seller_id=seller_id,
@@ -1845,32 +2292,33 @@ async def create_transaction_with_appointment(
             conversation.last_message_at = datetime.now()
             
             db.commit()
+            item_cache.invalidate(item_id)
             db.refresh(transaction)
             
             # Broadcast transaction creation via WebSocket
-            transaction_response = transaction_to_response(transaction)
+            transaction_response = TransactionResponse.model_validate(transaction)
             # Pass participant IDs directly to avoid redundant DB queries
-            await manager.broadcast_to_transaction(
+            background_tasks.add_task(
+                manager.broadcast_to_transaction,
                 {
                     "type": "transaction_created",
                     "data": pydantic_to_dict(transaction_response)
                 },
                 transaction.id,
-                user.id,
-                db,
+                user_id,
                 buyer_id=transaction.buyer_id,
                 seller_id=transaction.seller_id
             )
             
             # Also broadcast to conversation (pass participant IDs directly)
-            await manager.broadcast_to_conversation(
+            background_tasks.add_task(
+                manager.broadcast_to_conversation,
                 {
                     "type": "transaction_created",
                     "data": pydantic_to_dict(transaction_response)
                 },
                 conversation_id,
-                user.id,
-                db,
+                user_id,
                 participant1_id=conversation.participant1_id,
                 participant2_id=conversation.participant2_id
             )
@@ -1884,32 +2332,32 @@ async def create_transaction_with_appointment(
 @app.get("/api/transactions/by-conversation/{conversation_id}/all", response_model=List[TransactionResponse])
 def get_all_transactions_by_conversation(
     conversation_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
+    conversation: ConversationDB = Depends(get_conversation_or_404),
     db: Session = Depends(get_db),
 ):
     """Get all transactions for a conversation."""
-    conversation = get_or_404(ConversationDB, conversation_id, db, "Conversation not found")
-    
-    if user.id not in [conversation.participant1_id, conversation.participant2_id]:
+    if user_id not in [conversation.participant1_id, conversation.participant2_id]:
         raise HTTPException(status_code=403, detail="You can only view transactions for your own conversations")
     
-    transactions = db.query(TransactionDB).filter(
-        TransactionDB.conversation_id == conversation_id
-    ).order_by(TransactionDB.created_date.desc()).all()
+    transactions = db.scalars(
+        SELECT_TRANSACTIONS_BY_CONVERSATION, {"conversation_id": conversation_id}
+    ).all()
     
-    return [transaction_to_response(t) for t in transactions]
+    return [TransactionResponse.model_validate(t) for t in transactions]
 
 @app.patch("/api/transactions/{transaction_id}", response_model=TransactionResponse)
-async def update_transaction(
+def update_transaction(
     transaction_id: str,
     update_data: TransactionUpdate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Update a transaction (confirmations, meetup details)."""
     transaction = get_or_404(TransactionDB, transaction_id, db, "Transaction not found")
     
-    if user.id not in [transaction.buyer_id, transaction.seller_id]:
+    if user_id not in [transaction.buyer_id, transaction.seller_id]:
         raise HTTPException(status_code=403, detail="You can only update your own transactions")
     
     if transaction.status in ["completed", "cancelled"]:
@@ -1917,22 +2365,22 @@ async def update_transaction(
     
     try:
         if update_data.buyer_confirmed is not None:
-            if transaction.buyer_id != user.id:
+            if transaction.buyer_id != user_id:
                 raise HTTPException(status_code=403, detail="Only the buyer can set buyer_confirmed")
             transaction.buyer_confirmed = update_data.buyer_confirmed
         
         if update_data.seller_confirmed is not None:
-            if transaction.seller_id != user.id:
+            if transaction.seller_id != user_id:
                 raise HTTPException(status_code=403, detail="Only the seller can set seller_confirmed")
             transaction.seller_confirmed = update_data.seller_confirmed
         
         if update_data.buyer_cancel_confirmed is not None:
-            if transaction.buyer_id != user.id:
+            if transaction.buyer_id != user_id:
                 raise HTTPException(status_code=403, detail="Only the buyer can set buyer_cancel_confirmed")
             transaction.buyer_cancel_confirmed = update_data.buyer_cancel_confirmed
         
         if update_data.seller_cancel_confirmed is not None:
-            if transaction.seller_id != user.id:
+            if transaction.seller_id != user_id:
                 raise HTTPException(status_code=403, detail="Only the seller can set seller_cancel_confirmed")
             transaction.seller_cancel_confirmed = update_data.seller_cancel_confirmed
         
@@ -1956,11 +2404,11 @@ async def update_transaction(
             transaction.status = "completed"
             transaction.completed_date = datetime.now()
             
-            item = db.query(ItemDB).filter(ItemDB.id == transaction.item_id).first()
+            item = db.get(ItemDB, transaction.item_id)
             if item:
                 item.status = "sold"
             
-            seller = db.query(UserDB).filter(UserDB.id == transaction.seller_id).first()
+            seller = db.get(UserDB, transaction.seller_id)
             if seller:
                 seller.total_sales += 1
             
@@ -1977,7 +2425,7 @@ async def update_transaction(
                 
                 # Cancel associated buy request
                 if other_tx.buy_request_id:
-                    buy_req = db.query(BuyRequestDB).filter(BuyRequestDB.id == other_tx.buy_request_id).first()
+                    buy_req = db.get(BuyRequestDB, other_tx.buy_request_id)
                     if buy_req and buy_req.status == "accepted":
                         buy_req.status = "cancelled"
                         buy_req.responded_date = datetime.now()
@@ -1997,14 +2445,14 @@ async def update_transaction(
             transaction.status = "cancelled"
             transaction.completed_date = datetime.now()
             
-            item = db.query(ItemDB).filter(ItemDB.id == transaction.item_id).first()
+            item = db.get(ItemDB, transaction.item_id)
             if item and item.status == "reserved":
                 item.status = "available"
             
             # Also cancel the associated buy request(s) so buyer can request again
             # First, try to cancel the buy request linked to this transaction
             if transaction.buy_request_id:
-                buy_request = db.query(BuyRequestDB).filter(BuyRequestDB.id == transaction.buy_request_id).first()
+                buy_request = db.get(BuyRequestDB, transaction.buy_request_id)
                 if buy_request and buy_request.status == "accepted":
                     buy_request.status = "cancelled"
                     buy_request.responded_date = datetime.now()
@@ -2022,18 +2470,21 @@ async def update_transaction(
         
         db.commit()
         db.refresh(transaction)
+        # total_sales and the item's status may have changed
+        user_profile_cache.invalidate(transaction.seller_id)
+        item_cache.invalidate(transaction.item_id)
         
         # Broadcast transaction update via WebSocket to both buyer and seller
-        transaction_response = transaction_to_response(transaction)
+        transaction_response = TransactionResponse.model_validate(transaction)
         # Pass participant IDs directly to avoid redundant DB query
-        await manager.broadcast_to_transaction(
+        background_tasks.add_task(
+            manager.broadcast_to_transaction,
             {
                 "type": "transaction_update",
                 "data": pydantic_to_dict(transaction_response)
             },
             transaction_id,
-            user.id,
-            db,
+            user_id,
             buyer_id=transaction.buyer_id,
             seller_id=transaction.seller_id
         )
@@ -2045,15 +2496,16 @@ async def update_transaction(
         raise HTTPException(status_code=500, detail=f"Failed to update transaction: {str(e)}")
 
 @app.patch("/api/transactions/{transaction_id}/cancel", response_model=TransactionResponse)
-async def cancel_transaction(
+def cancel_transaction(
     transaction_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    background_tasks: BackgroundTasks,
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Cancel a transaction."""
     transaction = get_or_404(TransactionDB, transaction_id, db, "Transaction not found")
     
-    if user.id not in [transaction.buyer_id, transaction.seller_id]:
+    if user_id not in [transaction.buyer_id, transaction.seller_id]:
         raise HTTPException(status_code=403, detail="You can only cancel your own transactions")
     
     if transaction.status == "completed":
@@ -2063,14 +2515,14 @@ async def cancel_transaction(
         transaction.status = "cancelled"
         transaction.completed_date = datetime.now()
         
-        item = db.query(ItemDB).filter(ItemDB.id == transaction.item_id).first()
+        item = db.get(ItemDB, transaction.item_id)
         if item and item.status == "reserved":
             item.status = "available"
         
         # Also cancel the associated buy request(s) so buyer can request again
         # First, try to cancel the buy request linked to this transaction
         if transaction.buy_request_id:
-            buy_request = db.query(BuyRequestDB).filter(BuyRequestDB.id == transaction.buy_request_id).first()
+            buy_request = db.get(BuyRequestDB, transaction.buy_request_id)
             if buy_request and buy_request.status == "accepted":
                 buy_request.status = "cancelled"
                 buy_request.responded_date = datetime.now()
@@ -2088,18 +2540,19 @@ async def cancel_transaction(
         
         db.commit()
         db.refresh(transaction)
+        item_cache.invalidate(transaction.item_id)
         
         # Broadcast transaction update via WebSocket
-        transaction_response = transaction_to_response(transaction)
+        transaction_response = TransactionResponse.model_validate(transaction)
         # Pass participant IDs directly to avoid redundant DB query
-        await manager.broadcast_to_transaction(
+        background_tasks.add_task(
+            manager.broadcast_to_transaction,
             {
                 "type": "transaction_update",
                 "data": pydantic_to_dict(transaction_response)
             },
             transaction_id,
-            user.id,
-            db,
+            user_id,
             buyer_id=transaction.buyer_id,
             seller_id=transaction.seller_id
         )
@@ -2117,7 +2570,7 @@ async def cancel_transaction(
 @app.post("/api/reviews", response_model=ReviewResponse)
 def create_review(
     review_data: ReviewCreate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Create a review for a completed transaction. Buyer reviews seller, seller reviews buyer."""
@@ -2129,10 +2582,10 @@ def create_review(
     
     # Determine reviewer and reviewee
     # If current user is buyer, they review seller (and vice versa)
-    if user.id == transaction.buyer_id:
+    if user_id == transaction.buyer_id:
         reviewer_id = transaction.buyer_id
         reviewee_id = transaction.seller_id
-    elif user.id == transaction.seller_id:
+    elif user_id == transaction.seller_id:
         reviewer_id = transaction.seller_id
         reviewee_id = transaction.buyer_id
     else:
@@ -2143,25 +2596,23 @@ def create_review(
         raise HTTPException(status_code=400, detail="Rating must be between 1 and 5")
     
     # Check if user already reviewed this transaction
-    existing_review = db.query(ReviewDB).filter(
+    existing_review = db.scalar(select(exists().where(
         ReviewDB.transaction_id == review_data.transaction_id,
         ReviewDB.reviewer_id == reviewer_id
-    ).first()
+    )))
     
     if existing_review:
         raise HTTPException(status_code=400, detail="You have already reviewed this transaction")
     
     try:
         new_review = ReviewDB(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             transaction_id=review_data.transaction_id,
             item_id=transaction.item_id,
             reviewer_id=reviewer_id,
             reviewee_id=reviewee_id,
             rating=review_data.rating,
             comment=review_data.comment,
-            created_date=datetime.now(),
-            updated_date=datetime.now(),
         )
         
         db.add(new_review)
@@ -2170,12 +2621,13 @@ def create_review(
         
         # Recalculate and update reviewee's rating
         new_rating = calculate_user_rating(reviewee_id, db)
-        reviewee = db.query(UserDB).filter(UserDB.id == reviewee_id).first()
+        reviewee = db.get(UserDB, reviewee_id)
         if reviewee:
             reviewee.rating = new_rating
             db.commit()
+            user_profile_cache.invalidate(reviewee_id)
         
-        return review_to_response(new_review)
+        return ReviewResponse.model_validate(new_review)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create review: {str(e)}")
@@ -2203,28 +2655,28 @@ def get_reviews(
         return []
     
     reviews = query.order_by(ReviewDB.created_date.desc()).all()
-    return [review_to_response(review) for review in reviews]
+    return [ReviewResponse.model_validate(review) for review in reviews]
 
 
 @app.get("/api/reviews/{review_id}", response_model=ReviewResponse)
 def get_review(review_id: str, db: Session = Depends(get_db)):
     """Get a specific review by ID."""
     review = get_or_404(ReviewDB, review_id, db, "Review not found")
-    return review_to_response(review)
+    return ReviewResponse.model_validate(review)
 
 
 @app.put("/api/reviews/{review_id}/response", response_model=ReviewResponse)
 def add_review_response(
     review_id: str,
     response_data: ReviewUpdate,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Add a response to a review. Only the reviewee can add a response."""
     review = get_or_404(ReviewDB, review_id, db, "Review not found")
     
     # Only the reviewee can add a response
-    if review.reviewee_id != user.id:
+    if review.reviewee_id != user_id:
         raise HTTPException(status_code=403, detail="Only the reviewed user can add a response")
     
     if not response_data.response:
@@ -2235,7 +2687,7 @@ def add_review_response(
         review.updated_date = datetime.now()
         db.commit()
         db.refresh(review)
-        return review_to_response(review)
+        return ReviewResponse.model_validate(review)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to add response: {str(e)}")
@@ -2244,14 +2696,14 @@ def add_review_response(
 @app.delete("/api/reviews/{review_id}")
 def delete_review(
     review_id: str,
-    user: UserDB = Depends(get_current_user),  # Use dependency injection
+    user_id: str = Depends(get_current_user_id),  # Use dependency injection
     db: Session = Depends(get_db),
 ):
     """Delete a review. Only the reviewer can delete their own review."""
     review = get_or_404(ReviewDB, review_id, db, "Review not found")
     
     # Only the reviewer can delete their review
-    if review.reviewer_id != user.id:
+    if review.reviewer_id != user_id:
         raise HTTPException(status_code=403, detail="You can only delete your own reviews")
     
     try:
@@ -2261,10 +2713,11 @@ def delete_review(
         
         # Recalculate and update reviewee's rating after deletion
         new_rating = calculate_user_rating(reviewee_id, db)
-        reviewee = db.query(UserDB).filter(UserDB.id == reviewee_id).first()
+        reviewee = db.get(UserDB, reviewee_id)
         if reviewee:
             reviewee.rating = new_rating
             db.commit()
+            user_profile_cache.invalidate(reviewee_id)
         
         return {"message": "Review deleted successfully"}
     except Exception as e:
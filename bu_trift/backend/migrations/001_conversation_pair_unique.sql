@@ -0,0 +1,68 @@
+-- One conversation per item per unordered pair of users (PostgreSQL only).
+--
+-- Base.metadata.create_all creates uq_conversation_pair_item on new databases
+-- but never adds indexes to an existing conversations table, so databases
+-- created before the index was added need this migration. start.sh applies it
+-- on every boot (it is idempotent). To run it by hand:
+--
+--     psql "$DATABASE_URL" -1 -v ON_ERROR_STOP=1 -f migrations/001_conversation_pair_unique.sql
+--
+-- Existing (a, b) / (b, a) duplicates would make CREATE UNIQUE INDEX fail, so
+-- they are merged first. The oldest conversation of each pair is kept, and the
+-- messages, buy requests and transactions of the others are moved onto it.
+-- (Keep literal percent signs out of this file: start.sh sends it through the
+-- DB driver, which treats them as parameter markers.)
+
+CREATE TEMP TABLE conversation_duplicates ON COMMIT DROP AS
+SELECT id AS duplicate_id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (
+            PARTITION BY
+                LEAST(participant1_id, participant2_id),
+                GREATEST(participant1_id, participant2_id),
+                item_id
+            ORDER BY created_date, id
+        ) AS keep_id
+    FROM conversations
+) ranked
+WHERE id <> keep_id;
+
+UPDATE messages m
+SET conversation_id = d.keep_id
+FROM conversation_duplicates d
+WHERE m.conversation_id = d.duplicate_id;
+
+UPDATE buy_requests b
+SET conversation_id = d.keep_id
+FROM conversation_duplicates d
+WHERE b.conversation_id = d.duplicate_id;
+
+UPDATE transactions t
+SET conversation_id = d.keep_id
+FROM conversation_duplicates d
+WHERE t.conversation_id = d.duplicate_id;
+
+-- The kept conversation sorts by the newest message of any merged duplicate
+UPDATE conversations c
+SET last_message_at = merged.last_message_at
+FROM (
+    SELECT d.keep_id, MAX(dup.last_message_at) AS last_message_at
+    FROM conversation_duplicates d
+    JOIN conversations dup ON dup.id = d.duplicate_id
+    GROUP BY d.keep_id
+) merged
+WHERE c.id = merged.keep_id
+  AND merged.last_message_at IS NOT NULL
+  AND (c.last_message_at IS NULL OR c.last_message_at < merged.last_message_at);
+
+DELETE FROM conversations
+WHERE id IN (SELECT duplicate_id FROM conversation_duplicates);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_conversation_pair_item
+ON conversations (
+    LEAST(participant1_id, participant2_id),
+    GREATEST(participant1_id, participant2_id),
+    item_id
+);
@@ -0,0 +1,24 @@
+-- items.images as jsonb with a '[]' default, plus its GIN index (PostgreSQL only).
+--
+-- Databases created before ItemDB.images became JSONB still have a json
+-- column without a default and no ix_items_images_gin. The type change
+-- rewrites the table, so it only runs while the column is still json.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'items'
+          AND column_name = 'images'
+          AND data_type = 'json'
+    ) THEN
+        ALTER TABLE items ALTER COLUMN images TYPE jsonb USING images::jsonb;
+    END IF;
+END
+$$;
+
+ALTER TABLE items ALTER COLUMN images SET DEFAULT '[]';
+
+CREATE INDEX IF NOT EXISTS ix_items_images_gin ON items USING gin (images);
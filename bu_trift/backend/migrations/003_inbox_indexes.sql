@@ -0,0 +1,15 @@
+-- Inbox and unread-count indexes (see models/conversation.py, models/message.py).
+--
+-- create_all only builds these on new databases. The per-participant indexes
+-- serve each side of the OR in get_conversations, and the partial index keeps
+-- unread counts and mark-read to unread rows only.
+
+CREATE INDEX IF NOT EXISTS idx_conversation_p1_last_message
+ON conversations (participant1_id, last_message_at);
+
+CREATE INDEX IF NOT EXISTS idx_conversation_p2_last_message
+ON conversations (participant2_id, last_message_at);
+
+CREATE INDEX IF NOT EXISTS idx_message_unread
+ON messages (conversation_id, sender_id)
+WHERE is_read = false;
@@ -0,0 +1,14 @@
+-- Item browse and filter indexes (see models/item.py).
+--
+-- create_all only builds these on new databases: status + category browsing,
+-- the condition filter, and the partial index for available items by category.
+
+CREATE INDEX IF NOT EXISTS idx_item_status_category
+ON items (status, category);
+
+CREATE INDEX IF NOT EXISTS idx_item_condition
+ON items (condition);
+
+CREATE INDEX IF NOT EXISTS idx_item_available_category
+ON items (category)
+WHERE status = 'available';
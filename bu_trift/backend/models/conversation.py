@@ -15,6 +15,8 @@ class ConversationDB(Base):
         ),
         Index('idx_conversation_last_message', 'last_message_at'),  # For sorting conversations by recency
         Index('idx_conversation_item_participants', 'item_id', 'participant1_id', 'participant2_id'),  # For finding conversations by item
+        Index('idx_conversation_p1_last_message', 'participant1_id', 'last_message_at'),  # For a user's inbox ordered by recency
+        Index('idx_conversation_p2_last_message', 'participant2_id', 'last_message_at'),  # (one per side of the OR in get_conversations)
     )
     
     id = Column(String, primary_key=True, index=True)
@@ -31,3 +33,18 @@ class ConversationDB(Base):
     def __repr__(self):
         return f"<Conversation(id={self.id}, p1={self.participant1_id}, p2={self.participant2_id}, item={self.item_id})>"
 
+
+
+# One conversation per item per *unordered* pair of users. The constraint above
+# still lets (a, b) and (b, a) coexist, so concurrent requests from the two
+# users could each create one. LEAST/GREATEST are Postgres-only, so the index
+# is only created there. create_all only adds it to new databases; existing
+# ones get it (after merging reversed duplicates) from
+# migrations/001_conversation_pair_unique.sql, which start.sh applies.
+Index(
+    'uq_conversation_pair_item',
+    func.least(ConversationDB.participant1_id, ConversationDB.participant2_id),
+    func.greatest(ConversationDB.participant1_id, ConversationDB.participant2_id),
+    ConversationDB.item_id,
+    unique=True,
+).ddl_if(dialect='postgresql')
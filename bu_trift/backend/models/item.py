@@ -1,18 +1,11 @@
-from sqlalchemy import Column, String, Float, Boolean, DateTime
+from sqlalchemy import Column, String, Float, Boolean, DateTime, JSON
 from sqlalchemy.sql import func
-import os
-
-# Use appropriate JSON type based on database
-# PostgreSQL uses JSONB, SQLite uses JSON
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./butrift.db")
-if DATABASE_URL.startswith("postgresql://") or DATABASE_URL.startswith("postgres://"):
-    from sqlalchemy.dialects.postgresql import JSON
-else:
-    from sqlalchemy.dialects.sqlite import JSON
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
 
 from database import Base
 
-from sqlalchemy import Index
+from sqlalchemy import Index, text
 
 class ItemDB(Base):
     __tablename__ = "items"
@@ -20,6 +13,13 @@ class ItemDB(Base):
     __table_args__ = (
         Index('idx_item_seller_status', 'seller_id', 'status'),  # For filtering user's items by status
         Index('idx_item_status_created', 'status', 'created_date'),  # For homepage featured items
+        Index('idx_item_status_category', 'status', 'category'),  # For category browsing filtered by status
+        Index('idx_item_condition', 'condition'),  # For condition filter
+        Index(
+            'idx_item_available_category',
+            'category',
+            postgresql_where=text("status = 'available'"),
+        ),  # Partial index for the common "available items in category" listing
     )
     
     id = Column(String, primary_key=True, index=True)
@@ -32,7 +32,29 @@ class ItemDB(Base):
     status = Column(String, default="available", index=True)  # ADDED INDEX
     location = Column(String)
     is_negotiable = Column(Boolean, default=False)
-    created_date = Column(DateTime, server_default=func.now())
+    created_date = Column(DateTime, server_default=func.now())  # Set by the DB on insert
 
     # NEW FIELD — list of image URLs
-    images = Column(JSON, nullable=True)
+    # JSONB on PostgreSQL (whatever the driver in DATABASE_URL), JSON elsewhere
+    images = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True, server_default=text("'[]'"))
+
+    # Seller lookup (seller_id has no FK constraint, so the join is explicit).
+    # lazy="raise": callers must eager-load with selectinload(ItemDB.seller)
+    # instead of triggering one SELECT per item.
+    seller = relationship(
+        "UserDB",
+        primaryjoin="foreign(ItemDB.seller_id) == UserDB.id",
+        viewonly=True,
+        lazy="raise",
+    )
+
+
+# GIN index for JSONB containment/existence queries on images (e.g. items with
+# at least one image). Only Postgres has JSONB, so it is only created there.
+# Existing databases get the jsonb column and this index from
+# migrations/002_items_images_jsonb.sql.
+Index(
+    'ix_items_images_gin',
+    ItemDB.images,
+    postgresql_using='gin',
+).ddl_if(dialect='postgresql')
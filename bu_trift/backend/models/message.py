@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from database import Base
@@ -9,6 +9,12 @@ class MessageDB(Base):
     __table_args__ = (
         Index('idx_message_conversation_created', 'conversation_id', 'created_date'),  # For last message queries
         Index('idx_message_conversation_sender_read', 'conversation_id', 'sender_id', 'is_read'),  # For unread count queries
+        Index(
+            'idx_message_unread',
+            'conversation_id',
+            'sender_id',
+            postgresql_where=text("is_read = false"),
+        ),  # Partial index: unread counts and mark-read only touch unread rows
     )
     
     id = Column(String, primary_key=True, index=True)
@@ -7,7 +7,7 @@ class UserDB(Base):
     
     id = Column(String, primary_key=True, index=True)
     email = Column(String, unique=True, nullable=False, index=True)
-    firebase_uid = Column(String, unique=True, nullable=False)  # Firebase user ID
+    firebase_uid = Column(String, unique=True, nullable=False)  # Firebase user ID (the unique constraint indexes the per-request lookup)
     display_name = Column(String, nullable=False)
     # password_hash = Column(String, nullable=False)  # Hashed password, never store plain text
     is_verified = Column(Boolean, default=False)
@@ -15,6 +15,6 @@ class UserDB(Base):
     bio = Column(String)
     rating = Column(Float, default=0.0)
     total_sales = Column(Integer, default=0)
-    created_date = Column(DateTime, server_default=func.now())
+    created_date = Column(DateTime, server_default=func.now())  # Set by the DB on insert
     updated_date = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,34 @@
+"""
+Request rate limiting shared by the API endpoints.
+
+Authenticated requests are limited per Firebase UID (stashed on
+request.state by auth.verify_firebase_token); anything else falls back
+to the client IP. Set REDIS_URL to share counters across workers and
+instances, otherwise limits are kept in process memory.
+
+Responses from limited endpoints carry X-RateLimit-Limit/-Remaining/-Reset
+headers, and 429s also carry Retry-After.
+"""
+
+import os
+from fastapi import Request
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+
+def rate_limit_key(request: Request) -> str:
+    """Key requests by authenticated Firebase UID, or by client IP if unauthenticated."""
+    firebase_uid = getattr(request.state, "firebase_uid", None)
+    if firebase_uid:
+        return f"uid:{firebase_uid}"
+    return get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=os.getenv("REDIS_URL", "memory://"),
+    # X-RateLimit-* headers on limited endpoints, Retry-After on 429s. Limited
+    # endpoints must take a `response: Response` parameter for slowapi to
+    # attach them to non-Response return values.
+    headers_enabled=True,
+)
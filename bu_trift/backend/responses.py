@@ -0,0 +1,34 @@
+"""
+Response classes shared by the API.
+"""
+from typing import Iterable, Iterator
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (C extension, natively encodes datetimes)."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def iter_json_array(items: Iterable, batch_size: int = 500) -> Iterator[bytes]:
+    """
+    Encode an iterable as a JSON array, yielding one chunk per batch_size items.
+
+    Meant for StreamingResponse so large result sets are never materialised
+    in full before the first byte goes out.
+    """
+    yield b"["
+    batch = []
+    first = True
+    for item in items:
+        batch.append(orjson.dumps(item, option=orjson.OPT_NON_STR_KEYS))
+        if len(batch) >= batch_size:
+            yield (b"," if not first else b"") + b",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b"," if not first else b"") + b",".join(batch)
+    yield b"]"
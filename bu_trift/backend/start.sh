@@ -17,6 +17,36 @@ Base.metadata.create_all(bind=engine)
 print('Database tables created successfully')
 "
 
+# Apply the SQL migrations in migrations/ (PostgreSQL only). create_all never
+# alters a table that already exists, so indexes added to the models later -
+# e.g. uq_conversation_pair_item - reach existing databases this way. Each
+# file is idempotent and runs in its own transaction.
+python -c "
+from pathlib import Path
+from database import engine
+if engine.dialect.name == 'postgresql':
+    for path in sorted(Path('migrations').glob('*.sql')):
+        with engine.begin() as conn:
+            conn.exec_driver_sql(path.read_text())
+        print(f'Applied {path.name}')
+"
+
 # Start the server
-uvicorn main:app --host 0.0.0.0 --port $PORT
+# uvloop (libuv event loop) and httptools (C HTTP parser) are both installed by
+# uvicorn[standard]; uvloop is Linux/macOS only, so fall back to "auto" elsewhere.
+#
+# WEB_CONCURRENCY sets the worker count and defaults to 1. Only raise it once
+# WebSocket fan-out works across processes: ConnectionManager keeps its
+# active_connections in memory, so a message handled by one worker never
+# reaches sockets held by another. Each worker also has its own DB pool of up
+# to DB_POOL_SIZE + DB_MAX_OVERFLOW connections (30 by default), so
+# WEB_CONCURRENCY x that must stay below Postgres' max_connections. Set the
+# count explicitly rather than deriving it from nproc, which reports the
+# host's CPUs inside a container.
+LOOP=uvloop
+python -c "import uvloop" 2>/dev/null || LOOP=auto
+
+uvicorn main:app --host 0.0.0.0 --port $PORT \
+    --loop "$LOOP" --http httptools \
+    --workers "${WEB_CONCURRENCY:-1}"
 
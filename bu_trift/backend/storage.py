@@ -6,6 +6,7 @@ import cloudinary
 import cloudinary.uploader
 import logging
 import os
+from typing import BinaryIO, Union
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -48,7 +49,7 @@ except ValueError as e:
 
 
 def upload_file_to_cloudinary(
-    file_content: bytes,
+    file_content: Union[bytes, BinaryIO],
     filename: str,
     folder: str = "butrift/uploads"
 ) -> str:
@@ -56,7 +57,7 @@ def upload_file_to_cloudinary(
     Upload an image file to Cloudinary and return the public URL.
     
     Args:
-        file_content: The file content as bytes
+        file_content: The file content as bytes or a binary file object
         filename: The filename to use in storage
         folder: Folder path in Cloudinary (default: 'butrift/uploads')
     
@@ -2,8 +2,9 @@ import sys
 from pathlib import Path
 import os
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -32,6 +33,8 @@ if str(BACKEND_DIR) not in sys.path:
 from database import Base, get_db  # type: ignore
 from main import app               # type: ignore
 from auth import verify_token      # type: ignore
+from rate_limit import limiter     # type: ignore
+from cache import clear_all_caches # type: ignore
 
 
 # -------------------------------------------------------------------
@@ -63,6 +66,33 @@ def db():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture
+def sql_statements():
+    """
+    Record the SQL sent to the test database inside a `with` block:
+
+        with sql_statements() as statements:
+            client.get("/api/...")
+        assert not any("FROM users" in statement for statement in statements)
+
+    Statements are recorded with leading whitespace stripped.
+    """
+    @contextmanager
+    def record():
+        statements = []
+
+        def on_execute(conn, cursor, statement, *args):
+            statements.append(statement.lstrip())
+
+        event.listen(engine, "before_cursor_execute", on_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", on_execute)
+
+    return record
+
+
 @pytest.fixture(scope="function")
 def client(db):
     """
@@ -94,6 +124,10 @@ def client(db):
 
     app.dependency_overrides[verify_token] = override_verify_token
 
+    # Start every test with fresh rate-limit counters and empty response caches
+    limiter.reset()
+    clear_all_caches()
+
     with TestClient(app) as test_client:
         yield test_client
 
@@ -154,3 +154,184 @@ async def test_verify_firebase_token_unexpected_error(monkeypatch):
     err = exc.value
     assert err.status_code == 401
     assert "Failed to verify Firebase token" in err.detail
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_verify_firebase_token_caches_until_exp(monkeypatch):
+    """
+    A token with a future exp claim is verified once, then served from cache.
+    """
+    import time
+
+    calls = []
+
+    def fake_verify_id_token(id_token: str):
+        calls.append(id_token)
+        return {"uid": "cached-uid", "exp": int(time.time()) + 3600}
+
+    class DummyFirebaseAuth:
+        pass
+
+    dummy = DummyFirebaseAuth()
+    dummy.verify_id_token = fake_verify_id_token
+    monkeypatch.setattr(auth_module, "firebase_auth", dummy)
+
+    creds = make_creds("cacheable-token")
+    first = await auth_module.verify_firebase_token(credentials=creds)  # type: ignore
+    second = await auth_module.verify_firebase_token(credentials=creds)  # type: ignore
+
+    assert first["uid"] == second["uid"] == "cached-uid"
+    assert calls == ["cacheable-token"]
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_verify_firebase_token_does_not_cache_expiring_token(monkeypatch):
+    """
+    A token that expires within the leeway window is re-verified every time.
+    """
+    import time
+
+    calls = []
+
+    def fake_verify_id_token(id_token: str):
+        calls.append(id_token)
+        return {"uid": "short-lived-uid", "exp": int(time.time()) + 5}
+
+    class DummyFirebaseAuth:
+        pass
+
+    dummy = DummyFirebaseAuth()
+    dummy.verify_id_token = fake_verify_id_token
+    monkeypatch.setattr(auth_module, "firebase_auth", dummy)
+
+    creds = make_creds("short-lived-token")
+    await auth_module.verify_firebase_token(credentials=creds)  # type: ignore
+    await auth_module.verify_firebase_token(credentials=creds)  # type: ignore
+
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_websocket_token_reuses_http_token_cache(monkeypatch):
+    """
+    A token already verified by an HTTP request connects a WebSocket
+    without being verified again.
+    """
+    import time
+    from utils.websocket_auth import verify_websocket_token  # type: ignore
+
+    calls = []
+
+    def fake_verify_id_token(id_token: str):
+        calls.append(id_token)
+        return {"uid": "ws-uid", "exp": int(time.time()) + 3600}
+
+    class DummyFirebaseAuth:
+        pass
+
+    dummy = DummyFirebaseAuth()
+    dummy.verify_id_token = fake_verify_id_token
+    monkeypatch.setattr(auth_module, "firebase_auth", dummy)
+
+    await auth_module.verify_firebase_token(credentials=make_creds("shared-token"))  # type: ignore
+    decoded = await verify_websocket_token("shared-token")
+
+    assert decoded["uid"] == "ws-uid"
+    assert calls == ["shared-token"]
+
+
+# -------------------------------------------------------------------
+# Local RS256 verification (_decode_id_token)
+# -------------------------------------------------------------------
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    """RSA key standing in for Firebase's JWKS, with a project id configured."""
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    class FakeJWKClient:
+        def get_signing_key_from_jwt(self, token):
+            class Key:
+                key = private_key.public_key()
+            return Key()
+
+    monkeypatch.setenv("FIREBASE_PROJECT_ID", "butrift-test")
+    monkeypatch.setattr(auth_module, "_jwks_client", FakeJWKClient())
+    return private_key
+
+
+def make_id_token(private_key, **overrides) -> str:
+    import time
+    import jwt
+
+    now = int(time.time())
+    claims = {
+        "iss": "https://securetoken.google.com/butrift-test",
+        "aud": "butrift-test",
+        "sub": "uid-abc",
+        "iat": now - 10,
+        "auth_time": now - 10,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_key, algorithm="RS256")
+
+
+def test_decode_id_token_verifies_locally(signing_key):
+    decoded = auth_module._decode_id_token(make_id_token(signing_key))
+    assert decoded["uid"] == "uid-abc"
+
+
+@pytest.mark.parametrize(
+    "overrides, error",
+    [
+        ({"exp": 1}, "ExpiredIdTokenError"),
+        ({"aud": "other-project"}, "InvalidIdTokenError"),
+        ({"iss": "https://securetoken.google.com/other-project"}, "InvalidIdTokenError"),
+        ({"sub": ""}, "InvalidIdTokenError"),
+        ({"auth_time": 9_999_999_999}, "InvalidIdTokenError"),
+    ],
+)
+def test_decode_id_token_rejects_bad_claims(signing_key, overrides, error):
+    with pytest.raises(getattr(auth_module.firebase_auth, error)):
+        auth_module._decode_id_token(make_id_token(signing_key, **overrides))
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_key_fetch_outage_is_not_reported_as_invalid_token(signing_key, monkeypatch, caplog):
+    import jwt
+
+    class UnreachableJWKClient:
+        def get_signing_key_from_jwt(self, token):
+            raise jwt.PyJWKClientConnectionError("connection refused")
+
+    monkeypatch.setattr(auth_module, "_jwks_client", UnreachableJWKClient())
+    token = make_id_token(signing_key)
+    with pytest.raises(auth_module.firebase_auth.CertificateFetchError):
+        auth_module._decode_id_token(token)
+
+    with pytest.raises(HTTPException) as exc:
+        await auth_module.verify_firebase_token(credentials=make_creds(token))  # type: ignore
+    assert exc.value.status_code == 401
+    assert "Unexpected error verifying token" in caplog.text
+    assert "connection refused" in caplog.text
+
+
+def test_warm_signing_keys_prefetches_only_with_project_id(monkeypatch):
+    fetches = []
+
+    class FakeJWKClient:
+        def get_jwk_set(self):
+            fetches.append(1)
+            raise OSError("offline")  # failures are logged, not raised
+
+    monkeypatch.setattr(auth_module, "_jwks_client", FakeJWKClient())
+    monkeypatch.setattr(auth_module, "_firebase_project_id", lambda: None)
+    auth_module.warm_signing_keys()
+    assert fetches == []
+
+    monkeypatch.setattr(auth_module, "_firebase_project_id", lambda: "butrift-test")
+    auth_module.warm_signing_keys()
+    assert fetches == [1]
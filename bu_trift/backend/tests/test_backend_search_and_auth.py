@@ -211,3 +211,98 @@ def test_cannot_update_message_not_sender(client: TestClient, db: Session):
 
     assert upd.status_code in (403, 401)
 
+
+
+def test_cors_preflight_is_cacheable(client):
+    resp = client.options(
+        "/api/items",
+        headers={
+            "Origin": "http://localhost:5173",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization,content-type",
+        },
+    )
+    assert resp.status_code == 200
+    assert resp.headers["access-control-max-age"] == "86400"
+
+
+def test_startup_raises_threadpool_limit(client):
+    import anyio.to_thread
+    from main import THREADPOOL_SIZE
+
+    def read_limit():
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+
+    assert client.portal.call(read_limit) == THREADPOOL_SIZE
+
+
+def test_items_keyset_pagination(client: TestClient, db: Session):
+    from datetime import datetime, timedelta
+
+    seller = create_user(db, "seller-pages@bu.edu")
+    for i in range(5):
+        item = create_item(db, seller, f"Page Item {i}", "misc", "good", 1.0 + i)
+        item.created_date = datetime(2024, 1, 1) + timedelta(minutes=i)
+    db.commit()
+
+    first = client.get("/api/items", params={"seller_id": seller.id, "limit": 2})
+    assert first.status_code == 200
+    assert [i["title"] for i in first.json()] == ["Page Item 4", "Page Item 3"]
+
+    second = client.get(
+        "/api/items",
+        params={"seller_id": seller.id, "limit": 2, "before": first.json()[-1]["created_date"]},
+    )
+    assert [i["title"] for i in second.json()] == ["Page Item 2", "Page Item 1"]
+
+    assert client.get("/api/items", params={"limit": 0}).status_code == 422
+
+
+def test_items_keyset_pagination_splits_same_timestamp(client: TestClient, db: Session):
+    from datetime import datetime
+
+    seller = create_user(db, "seller-ties@bu.edu")
+    for i in range(4):
+        item = create_item(db, seller, f"Tie Item {i}", "misc", "good", 1.0 + i)
+        item.created_date = datetime(2024, 1, 1, 12, 0, 0)
+    db.commit()
+
+    params = {"seller_id": seller.id, "limit": 3}
+    seen = []
+    while True:
+        page = client.get("/api/items", params=params).json()
+        if not page:
+            break
+        seen += [i["id"] for i in page]
+        params.update(before=page[-1]["created_date"], before_id=page[-1]["id"])
+        assert len(seen) <= 4
+    assert len(set(seen)) == 4
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_items_list_statement_is_built_once_per_filter_shape(client: TestClient, db: Session):
+    import main  # type: ignore
+
+    seller = create_user(db, "seller-shapes@bu.edu")
+    create_item(db, seller, "Shape Chair", "furniture", "good", 10.0)
+    create_item(db, seller, "Shape Lamp", "lighting", "good", 12.0)
+    main._build_items_select.cache_clear()
+
+    furniture = client.get("/api/items", params={"seller_id": seller.id, "category": "furniture"})
+    lighting = client.get("/api/items", params={"seller_id": seller.id, "category": "lighting"})
+
+    assert [i["title"] for i in furniture.json()] == ["Shape Chair"]
+    assert [i["title"] for i in lighting.json()] == ["Shape Lamp"]
+    info = main._build_items_select.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_item_created_date_renders_the_same_in_list_and_detail(client: TestClient, db: Session):
+    seller = create_user(db, "seller-dates@bu.edu")
+    item = create_item(db, seller, "Dated Desk", "furniture", "good", 30.0)
+    item_id = item.id
+
+    listed = client.get("/api/items", params={"seller_id": seller.id}).json()[0]
+    detail = client.get(f"/api/items/{item_id}").json()
+
+    assert listed["created_date"] == detail["created_date"]
@@ -156,3 +156,27 @@ def test_create_item_error_handling(client: TestClient, db: Session):
     # Actually, price validation happens in endpoint, so should be 400
     assert resp.status_code in [400, 422]
 
+
+
+# -------------------------------------------------------------------
+# Seller relationship
+# -------------------------------------------------------------------
+
+def test_item_seller_requires_eager_loading(db: Session):
+    """ItemDB.seller never lazy-loads; it must be fetched with selectinload"""
+    from sqlalchemy.orm import selectinload
+
+    seller = get_or_create_current_user(db)
+    seller_id = seller.id
+    create_item_for_user(db, seller)
+    create_item_for_user(db, seller)
+    db.expunge_all()
+
+    items = db.query(ItemDB).all()
+    with pytest.raises(Exception):
+        items[0].seller
+    db.expunge_all()
+
+    items = db.query(ItemDB).options(selectinload(ItemDB.seller)).all()
+    assert len(items) == 2
+    assert all(item.seller.id == seller_id for item in items)
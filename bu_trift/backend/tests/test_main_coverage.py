@@ -311,6 +311,9 @@ def test_mark_conversation_read_error_handling(client: TestClient, db: Session):
     # Test error path (lines 1299-1301)
     resp = client.put(f"/api/conversations/{conv.id}/mark-read?user_id={user.id}")
     assert resp.status_code == 200
+    assert resp.json()["message"] == "Marked 1 messages as read"
+    db.refresh(msg)
+    assert msg.is_read is True
 
 
 # -------------------------------------------------------------------
@@ -526,3 +529,41 @@ def test_create_conversation_error_handling(client: TestClient, db: Session):
     })
     assert resp.status_code == 200
 
+
+
+def test_delete_current_user_removes_related_rows(client: TestClient, db: Session, monkeypatch):
+    from firebase_admin import auth as firebase_auth
+
+    deleted_firebase_uids = []
+    monkeypatch.setattr(firebase_auth, "delete_user", deleted_firebase_uids.append)
+
+    user = get_or_create_current_user(db)
+    other = create_other_user(db)
+    bystander = create_other_user(db, email="bystander@bu.edu")
+    own_item = create_item_for_user(db, user)
+    other_item = create_item_for_user(db, other)
+    conv = create_conversation(db, other, user, other_item)
+    unrelated = create_conversation(db, other, bystander, other_item)
+    for conversation, sender in ((conv, other), (conv, user), (unrelated, bystander)):
+        db.add(MessageDB(
+            id=str(uuid.uuid4()),
+            conversation_id=conversation.id,
+            sender_id=sender.id,
+            content="hi",
+        ))
+    db.commit()
+    user_id, other_id, unrelated_id = user.id, other.id, unrelated.id
+    own_item_id, other_item_id = own_item.id, other_item.id
+
+    resp = client.delete("/api/users/me")
+    assert resp.status_code == 200
+    assert deleted_firebase_uids == ["test-firebase-uid-123"]
+
+    db.expire_all()
+    assert db.get(UserDB, user_id) is None
+    assert db.get(UserDB, other_id) is not None
+    assert db.get(ItemDB, own_item_id) is None
+    assert db.get(ItemDB, other_item_id) is not None
+    assert [c.id for c in db.query(ConversationDB).all()] == [unrelated_id]
+    assert [m.conversation_id for m in db.query(MessageDB).all()] == [unrelated_id]
+    assert client.get(f"/api/items/{own_item_id}").status_code == 404
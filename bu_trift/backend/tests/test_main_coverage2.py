@@ -3,11 +3,13 @@
 
 import sys
 from pathlib import Path
+import json
 import uuid
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
+from starlette.websockets import WebSocketState
 
 # -------------------------------------------------------------------
 # Make sure backend modules are importable
@@ -326,6 +328,21 @@ def test_get_message_not_participant(client: TestClient, db: Session):
     assert resp.status_code == 403
 
 
+def test_is_conversation_participant(db: Session):
+    from main import is_conversation_participant  # type: ignore
+
+    user = get_or_create_current_user(db)
+    other = create_other_user(db)
+    outsider = create_other_user(db, "outsider@bu.edu")
+    item = create_item_for_user(db, other)
+    conv = create_conversation(db, user, other, item)
+
+    assert is_conversation_participant(db, conv.id, user.id)
+    assert is_conversation_participant(db, conv.id, other.id)
+    assert not is_conversation_participant(db, conv.id, outsider.id)
+    assert not is_conversation_participant(db, "missing-conv", user.id)
+
+
 def test_mark_conversation_read_wrong_user(client: TestClient, db: Session):
     """Test marking conversation read with wrong user_id"""
     user = get_or_create_current_user(db)
@@ -360,3 +377,243 @@ def test_mark_conversation_read_not_participant(client: TestClient, db: Session)
     assert resp.status_code == 403
     assert "not a participant" in resp.text
 
+
+
+# -------------------------------------------------------------------
+# WebSocket ConnectionManager
+# -------------------------------------------------------------------
+
+class FakeWebSocket:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.sent = []
+        self.client_state = WebSocketState.CONNECTED
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        if self.fail:
+            raise RuntimeError("socket closed")
+        self.sent.append(json.loads(data))
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_connection_manager_sends_to_all_connections_despite_failures():
+    from main import ConnectionManager  # type: ignore
+
+    manager = ConnectionManager()
+    healthy, broken, other = FakeWebSocket(), FakeWebSocket(fail=True), FakeWebSocket()
+    await manager.connect(healthy, "u1")
+    await manager.connect(broken, "u1")
+    await manager.connect(other, "u1")
+
+    await manager.send_personal_message({"type": "ping"}, "u1")
+    assert healthy.sent == [{"type": "ping"}]
+    assert other.sent == [{"type": "ping"}]
+
+    # The failed send already dropped the broken socket
+    assert manager.active_connections["u1"] == {healthy, other}
+    manager.disconnect(broken, "u1")  # disconnecting again is harmless
+    assert manager.active_connections["u1"] == {healthy, other}
+
+    manager.disconnect(healthy, "u1")
+    manager.disconnect(other, "u1")
+    assert "u1" not in manager.active_connections
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_prune_disconnected_drops_closed_sockets():
+    from main import ConnectionManager  # type: ignore
+
+    manager = ConnectionManager()
+    open_socket, closed_socket = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(open_socket, "u1")
+    await manager.connect(closed_socket, "u1")
+    lone_closed = FakeWebSocket()
+    await manager.connect(lone_closed, "u2")
+
+    closed_socket.client_state = WebSocketState.DISCONNECTED
+    lone_closed.client_state = WebSocketState.DISCONNECTED
+
+    assert manager.prune_disconnected() == 2
+    assert manager.active_connections == {"u1": {open_socket}}
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_broadcast_to_conversation_reuses_cached_participants(db: Session, monkeypatch):
+    import database  # type: ignore
+    from sqlalchemy.orm import sessionmaker
+    from main import ConnectionManager  # type: ignore
+
+    sessions = []
+
+    def session_factory():
+        sessions.append(1)
+        return sessionmaker(bind=db.get_bind())()
+
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    user = get_or_create_current_user(db)
+    other = create_other_user(db)
+    item = create_item_for_user(db, other)
+    conv = create_conversation(db, user, other, item)
+
+    manager = ConnectionManager()
+    socket = FakeWebSocket()
+    await manager.connect(socket, other.id)
+
+    # First broadcast resolves participants with its own short-lived session...
+    await manager.broadcast_to_conversation({"type": "a"}, conv.id, user.id)
+    # ...later ones come from the cache
+    await manager.broadcast_to_conversation({"type": "b"}, conv.id, user.id)
+    assert socket.sent == [{"type": "a"}, {"type": "b"}]
+    assert len(sessions) == 1
+
+    # Unknown conversations are dropped quietly
+    await manager.broadcast_to_conversation({"type": "c"}, "missing-conv", user.id)
+    assert socket.sent == [{"type": "a"}, {"type": "b"}]
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_broadcast_to_transaction_reuses_cached_participants(db: Session, monkeypatch):
+    import database  # type: ignore
+    from sqlalchemy.orm import sessionmaker
+    from models.transaction import TransactionDB  # type: ignore
+    from main import ConnectionManager  # type: ignore
+
+    user = get_or_create_current_user(db)
+    other = create_other_user(db)
+    item = create_item_for_user(db, other)
+    conv = create_conversation(db, user, other, item)
+    transaction = TransactionDB(
+        id=str(uuid.uuid4()),
+        item_id=item.id,
+        buyer_id=user.id,
+        seller_id=other.id,
+        conversation_id=conv.id,
+    )
+    db.add(transaction)
+    db.commit()
+
+    sessions = []
+
+    def session_factory():
+        sessions.append(1)
+        return sessionmaker(bind=db.get_bind())()
+
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+
+    manager = ConnectionManager()
+    socket = FakeWebSocket()
+    await manager.connect(socket, other.id)
+
+    await manager.broadcast_to_transaction({"type": "a"}, transaction.id, user.id)
+    await manager.broadcast_to_transaction({"type": "b"}, transaction.id, user.id)
+    assert socket.sent == [{"type": "a"}, {"type": "b"}]
+    assert len(sessions) == 1
+
+
+@pytest.mark.anyio(backend="asyncio")
+async def test_broadcast_encodes_payload_once(monkeypatch):
+    from main import ConnectionManager  # type: ignore
+
+    manager = ConnectionManager()
+    buyer_socket, seller_tab1, seller_tab2 = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.connect(buyer_socket, "buyer")
+    await manager.connect(seller_tab1, "seller")
+    await manager.connect(seller_tab2, "seller")
+
+    calls = []
+    original_encode = ConnectionManager.encode
+    monkeypatch.setattr(
+        ConnectionManager, "encode",
+        staticmethod(lambda message: calls.append(message) or original_encode(message)),
+    )
+
+    message = {"type": "transaction_update", "data": {"id": "t1"}}
+    await manager.broadcast_to_transaction(message, "t1", "someone-else", buyer_id="buyer", seller_id="seller")
+
+    assert calls == [message]
+    assert buyer_socket.sent == seller_tab1.sent == seller_tab2.sent == [message]
+
+
+def test_create_message_broadcasts_to_recipient_after_response(client: TestClient, db: Session):
+    from main import manager  # type: ignore
+
+    user = get_or_create_current_user(db)
+    other = create_other_user(db)
+    item = create_item_for_user(db, other)
+    conv = create_conversation(db, user, other, item)
+
+    socket = FakeWebSocket()
+    manager.active_connections[other.id] = {socket}
+    try:
+        resp = client.post(
+            "/api/messages",
+            json={"conversation_id": conv.id, "sender_id": user.id, "content": "Hi"},
+        )
+        assert resp.status_code == 200
+    finally:
+        manager.active_connections.pop(other.id, None)
+
+    # TestClient runs background tasks before returning the response
+    assert [m["type"] for m in socket.sent] == ["new_message"]
+    assert socket.sent[0]["data"]["id"] == resp.json()["id"]
+
+
+def test_create_buy_request_broadcasts_in_order_after_response(client: TestClient, db: Session):
+    from main import manager  # type: ignore
+
+    get_or_create_current_user(db)
+    seller = create_other_user(db)
+    item = create_item_for_user(db, seller)
+
+    socket = FakeWebSocket()
+    manager.active_connections[seller.id] = {socket}
+    try:
+        resp = client.post("/api/buy-requests", json={"item_id": item.id})
+        assert resp.status_code == 200
+    finally:
+        manager.active_connections.pop(seller.id, None)
+
+    assert [m["type"] for m in socket.sent] == ["buy_request_update", "new_message"]
+    assert socket.sent[0]["data"]["id"] == resp.json()["id"]
+
+
+def test_websocket_auth_lookup_runs_off_the_event_loop(client: TestClient, db: Session, monkeypatch):
+    import asyncio
+    import database  # type: ignore
+    import main  # type: ignore
+    from sqlalchemy.orm import sessionmaker
+    from starlette.websockets import WebSocketDisconnect
+
+    user = get_or_create_current_user(db)
+    user_id = user.id
+
+    async def fake_verify(token):
+        return {"uid": "test-firebase-uid-123"}
+
+    on_event_loop = []
+    original_lookup = main.load_websocket_user_id
+
+    def recording_lookup(firebase_uid):
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(True)
+        except RuntimeError:
+            on_event_loop.append(False)
+        return original_lookup(firebase_uid)
+
+    monkeypatch.setattr(main, "verify_websocket_token", fake_verify)
+    monkeypatch.setattr(main, "load_websocket_user_id", recording_lookup)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=db.get_bind()))
+
+    with client.websocket_connect(f"/ws/{user_id}?token=t"):
+        assert user_id in main.manager.active_connections
+    assert on_event_loop == [False]
+
+    with pytest.raises(WebSocketDisconnect) as exc:
+        with client.websocket_connect("/ws/someone-else?token=t") as ws:
+            ws.receive_text()
+    assert exc.value.code == 1008
@@ -245,6 +245,36 @@ def test_add_review_response_error_handling(client: TestClient, db: Session):
     assert "Only the reviewed user can add a response" in resp.text or "Only the reviewee" in resp.text
 
 
+def test_add_review_response_uses_cached_user_id(client: TestClient, db: Session, sql_statements):
+    """Once the uid -> id mapping is cached, the reviewee's response needs no users query"""
+    seller = get_or_create_current_user(db)
+    buyer = create_other_user(db, "reviewer@bu.edu")
+    item = create_item_for_user(db, seller)
+    conv = create_conversation(db, buyer, seller, item)
+    tx = create_completed_transaction(db, buyer, seller, item, conv)
+    review = ReviewDB(
+        id=str(uuid.uuid4()),
+        transaction_id=tx.id,
+        item_id=item.id,
+        reviewer_id=buyer.id,
+        reviewee_id=seller.id,
+        rating=4,
+    )
+    db.add(review)
+    db.commit()
+    review_id = review.id
+
+    # Warm the uid cache
+    assert client.get(f"/api/conversations?user_id={seller.id}").status_code == 200
+
+    with sql_statements() as statements:
+        resp = client.put(f"/api/reviews/{review_id}/response", json={"response": "Thanks!"})
+
+    assert resp.status_code == 200
+    assert resp.json()["response"] == "Thanks!"
+    assert not any("FROM users" in statement for statement in statements)
+
+
 def test_delete_review_error_handling(client: TestClient, db: Session):
     """Test delete review error handling"""
     buyer = get_or_create_current_user(db)
@@ -270,3 +300,27 @@ def test_delete_review_error_handling(client: TestClient, db: Session):
     resp = client.delete(f"/api/reviews/{review.id}")
     assert resp.status_code == 200
 
+
+
+def test_calculate_user_rating_averages_in_sql(db: Session):
+    from main import calculate_user_rating
+
+    buyer = get_or_create_current_user(db)
+    seller = create_other_user(db)
+    assert calculate_user_rating(seller.id, db) == 0.0
+
+    for rating in (5, 4, 4):
+        item = create_item_for_user(db, seller)
+        conv = create_conversation(db, buyer, seller, item)
+        tx = create_completed_transaction(db, buyer, seller, item, conv)
+        db.add(ReviewDB(
+            id=str(uuid.uuid4()),
+            transaction_id=tx.id,
+            item_id=item.id,
+            reviewer_id=buyer.id,
+            reviewee_id=seller.id,
+            rating=rating,
+        ))
+    db.commit()
+
+    assert calculate_user_rating(seller.id, db) == 4.33
@@ -19,7 +19,9 @@ if str(BACKEND_DIR) not in sys.path:
 # Now we can import from backend code
 from utils import db_utils  # type: ignore
 from utils import websocket_auth  # type: ignore
+import auth as auth_module  # type: ignore
 from models.user import UserDB  # type: ignore
+from responses import iter_json_array  # type: ignore
 
 
 # -------------------------------------------------------------------
@@ -150,6 +152,25 @@ def test_handle_db_operation_wraps_generic_exception(db):
     assert "Something unexpected happened" in err.detail
 
 
+def test_new_id_is_time_ordered_uuid7():
+    """
+    new_id() should return canonical UUIDv7 strings that sort by creation time.
+    """
+    import time
+    import uuid
+
+    first = db_utils.new_id()
+    time.sleep(0.002)
+    second = db_utils.new_id()
+
+    parsed = uuid.UUID(first)
+    assert str(parsed) == first
+    assert parsed.version == 7
+    assert parsed.variant == uuid.RFC_4122
+    assert first < second
+    assert abs((parsed.int >> 80) - time.time_ns() // 1_000_000) < 5_000
+
+
 # ===================================================================
 # Part D – Tests for utils/websocket_auth.py
 #   - verify_websocket_token
@@ -174,9 +195,9 @@ async def test_verify_websocket_token_success(monkeypatch):
             "email": "ws-user@bu.edu",
         }
 
-    # Patch the firebase_auth inside websocket_auth module
+    # Patch the firebase_auth used by auth, which verifies WebSocket tokens too
     monkeypatch.setattr(
-        websocket_auth.firebase_auth,
+        auth_module.firebase_auth,
         "verify_id_token",
         fake_verify_id_token,
     )
@@ -201,7 +222,7 @@ async def test_verify_websocket_token_failure_returns_none(monkeypatch):
         raise Exception("Token invalid or expired")
 
     monkeypatch.setattr(
-        websocket_auth.firebase_auth,
+        auth_module.firebase_auth,
         "verify_id_token",
         fake_verify_id_token,
     )
@@ -239,3 +260,16 @@ def test_get_user_from_firebase_uid_returns_none_when_missing(db):
     """
     found = websocket_auth.get_user_from_firebase_uid("non-existent-uid", db)
     assert found is None
+
+
+# -------------------------------------------------------------------
+# responses.iter_json_array
+# -------------------------------------------------------------------
+
+@pytest.mark.parametrize("count", [0, 1, 2, 3, 7])
+def test_iter_json_array_produces_valid_json(count):
+    import json
+
+    items = [{"id": i} for i in range(count)]
+    body = b"".join(iter_json_array(iter(items), batch_size=2))
+    assert json.loads(body) == items
@@ -10,6 +10,9 @@ from sqlalchemy.orm import Session
 from typing import Type, TypeVar
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+import os
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +30,7 @@ def get_or_404(
     Get a model instance by ID or raise 404 error.
     
     This function extracts the common pattern of:
-    1. Querying model by ID
+    1. Looking up model by primary key
     2. Checking if instance exists
     3. Raising 404 if not found
     4. Returning instance
@@ -48,7 +51,8 @@ def get_or_404(
         item = get_or_404(ItemDB, item_id, db, "Item not found")
         user = get_or_404(UserDB, user_id, db)
     """
-    instance = db.query(model_class).filter(model_class.id == item_id).first()
+    # Session.get() checks the identity map first and only queries on a miss
+    instance = db.get(model_class, item_id)
     
     if not instance:
         error_msg = error_message or f"{model_class.__name__} not found"
@@ -57,6 +61,44 @@ def get_or_404(
     return instance
 
 
+def new_id() -> str:
+    """
+    Generate a primary key as a time-ordered UUIDv7 string (RFC 9562).
+    
+    The leading 48 bits are the Unix time in milliseconds, so new rows land at
+    the right edge of the primary-key B-tree instead of at random pages the way
+    uuid4 keys do. The text format is unchanged, so existing String id columns
+    and stored uuid4 ids keep working.
+    
+    Usage:
+        item = ItemDB(id=new_id(), ...)
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+def dialect_insert(db: Session, model_class: Type[ModelType]):
+    """
+    Return an INSERT construct for the session's dialect.
+    
+    The PostgreSQL and SQLite insert() variants both support
+    on_conflict_do_nothing()/on_conflict_do_update(), which the generic
+    sqlalchemy.insert() does not.
+    
+    Usage:
+        stmt = dialect_insert(db, ConversationDB).values(...).on_conflict_do_nothing(
+            index_elements=["participant1_id", "participant2_id", "item_id"]
+        )
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model_class)
+
+
 def handle_db_operation(
     operation,
     db: Session,
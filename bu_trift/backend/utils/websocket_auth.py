@@ -7,8 +7,8 @@ this module provides helper functions for WebSocket authentication.
 
 from sqlalchemy.orm import Session
 from models.user import UserDB
-from typing import Optional, Tuple
-from firebase_admin import auth as firebase_auth
+from typing import Optional
+from auth import verify_id_token_cached
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,11 +18,15 @@ async def verify_websocket_token(token: str) -> Optional[dict]:
     """
     Verify Firebase token from WebSocket connection.
     
+    Shares the HTTP endpoints' verified-token cache, so a client that just
+    made API calls with the same token connects without another signature
+    check. The token is only verified at connect time, not per message.
+    
     Returns:
         Decoded token data if valid, None otherwise
     """
     try:
-        decoded = firebase_auth.verify_id_token(token)
+        decoded = await verify_id_token_cached(token)
         return decoded
     except Exception as e:
         logger.error(f"WebSocket token verification failed: {e}")